@@ -1,50 +1,70 @@
-from docx import Document
-from docx.oxml.ns import qn
+import argparse
+from lxml import etree
+from docx_fast import NS, iter_paragraph_xml, load_styles
 
-doc = Document('main_word_styled.docx')
+PATH = 'main_word_styled.docx'
+GET_JC = etree.XPath('string(w:pPr/w:jc/@w:val)', namespaces=NS)
+HAS_BIDI = etree.XPath('boolean(w:pPr/w:bidi)', namespaces=NS)
 
-# Check all heading paragraphs and their actual XML jc values
-print("=== Heading alignment audit ===\n")
+# w:jc value → the label python-docx prints for its WD_ALIGN_PARAGRAPH member
+JC_TO_LABEL = {
+    'left': 'LEFT (0)', 'center': 'CENTER (1)', 'right': 'RIGHT (2)',
+    'both': 'JUSTIFY (3)', 'distribute': 'DISTRIBUTE (4)',
+    'mediumKashida': 'JUSTIFY_MED (5)', 'highKashida': 'JUSTIFY_HI (7)',
+    'lowKashida': 'JUSTIFY_LOW (8)', 'thaiDistribute': 'THAI_JUSTIFY (9)',
+    None: 'None',
+}
 
-for i, p in enumerate(doc.paragraphs):
-    style = p.style.name
-    if 'Heading' not in style and i > 24:
-        continue
-    if i > 24 and 'Heading' not in style:
-        continue
-    
-    text = p.text.strip()
-    if not text:
-        continue
-    
-    ppr = p._element.find(qn('w:pPr'))
+
+def run_audit(path=PATH, verify=False):
+    """Report raw w:jc / w:bidi and the matching alignment label for `path`.
+
+    With `verify`, the label comes from python-docx's own w:jc → enum mapping
+    instead of JC_TO_LABEL.
+    """
+    if verify:
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+    style_names, default_style, style_elements = load_styles(path)
+
+    # Check all heading paragraphs and their actual XML jc values
+    print("=== Heading alignment audit ===\n")
+
+    for i, style_val, p_el, text in iter_paragraph_xml(path):
+        style = style_names.get(style_val, default_style)
+        # Only the front matter (first 25) and headings are reported
+        if i > 24 and 'Heading' not in style:
+            continue
     
-    # Get jc value
-    jc = None
-    if ppr is not None:
-        jc_el = ppr.find(qn('w:jc'))
-        jc = jc_el.get(qn('w:val')) if jc_el is not None else None
+        text = text.strip()
+        if not text:
+            continue
     
-    # Get bidi
-    bidi = ppr.find(qn('w:bidi')) if ppr is not None else None
-    has_bidi = bidi is not None
+        # Get jc value and bidi
+        jc = GET_JC(p_el) or None
+        has_bidi = HAS_BIDI(p_el)
     
-    # Python-docx alignment
-    py_align = p.paragraph_format.alignment
+        # Python-docx alignment label
+        if verify:
+            py_align = WD_ALIGN_PARAGRAPH.from_xml(jc) if jc is not None else None
+        else:
+            py_align = JC_TO_LABEL.get(jc, jc)
     
-    if i <= 24 or 'Heading' in style:
         print(f"[{i:4d}] {style:12s} | jc={str(jc):8s} | bidi={has_bidi} | py_align={py_align} | {text[:50]}")
 
-# Also check style-level settings
-print("\n=== Style-level alignment ===")
-for sname in ['Normal', 'Heading 1', 'Heading 2', 'Heading 3', 'Heading 4']:
-    if sname in doc.styles:
-        s = doc.styles[sname]
-        ppr = s.element.find(qn('w:pPr'))
-        jc = None
-        bidi_s = False
-        if ppr is not None:
-            jc_el = ppr.find(qn('w:jc'))
-            jc = jc_el.get(qn('w:val')) if jc_el is not None else None
-            bidi_s = ppr.find(qn('w:bidi')) is not None
+    # Also check style-level settings
+    print("\n=== Style-level alignment ===")
+    for sname in ['Normal', 'Heading 1', 'Heading 2', 'Heading 3', 'Heading 4']:
+        s = style_elements.get(sname)
+        if s is None:
+            continue
+        # w:style carries its own w:pPr, so the paragraph XPaths apply as-is
+        jc = GET_JC(s) or None
+        bidi_s = HAS_BIDI(s)
         print(f"  {sname:12s} | style_jc={str(jc):8s} | style_bidi={bidi_s}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Audit paragraph alignment in the styled DOCX.')
+    parser.add_argument('--verify', action='store_true',
+                        help="resolve alignment through python-docx instead of JC_TO_LABEL")
+    run_audit(verify=parser.parse_args().verify)
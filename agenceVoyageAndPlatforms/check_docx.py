@@ -1,30 +1,39 @@
-from docx import Document
-doc = Document('main_word.docx')
-print(f'Paragraphs: {len(doc.paragraphs)}')
-print(f'Tables: {len(doc.tables)}')
-print()
-
-# Show first 15 paragraphs with their styles
-for i, p in enumerate(doc.paragraphs[:20]):
-    text = p.text.strip()
-    if text:
-        style = p.style.name
-        preview = text[:80] + ('...' if len(text) > 80 else '')
-        print(f'[{style}] {preview}')
-
-print()
-print('--- Middle content sample ---')
-mid = len(doc.paragraphs) // 2
-for p in doc.paragraphs[mid:mid+5]:
-    text = p.text.strip()
-    if text:
-        preview = text[:80] + ('...' if len(text) > 80 else '')
-        print(f'[{p.style.name}] {preview}')
-
-print()
-print('--- Tables check ---')
-for i, table in enumerate(doc.tables[:3]):
-    rows = len(table.rows)
-    cols = len(table.columns)
-    first_cell = table.cell(0,0).text.strip()[:50]
-    print(f'Table {i+1}: {rows} rows x {cols} cols | First cell: {first_cell}')
+from docx_fast import iter_body
+
+
+def run_check_docx(blocks):
+    """Paragraph/table counts and content samples for the iter_body() `blocks`."""
+    paras, tables = [], []
+    for kind, info in blocks:
+        (paras if kind == 'p' else tables).append(info)
+
+    n = len(paras)
+    mid = n // 2
+    print(f'Paragraphs: {n}')
+    print(f'Tables: {len(tables)}')
+    print()
+
+    # Show first 15 paragraphs with their styles
+    for i, style, text, _, _ in paras[:20]:
+        text = text.strip()
+        if text:
+            preview = text[:80] + ('...' if len(text) > 80 else '')
+            print(f'[{style}] {preview}')
+
+    print()
+    print('--- Middle content sample ---')
+    for _, style, text, _, _ in paras[mid:mid+5]:
+        text = text.strip()
+        if text:
+            preview = text[:80] + ('...' if len(text) > 80 else '')
+            print(f'[{style}] {preview}')
+
+    print()
+    print('--- Tables check ---')
+    for i, (rows, cols, first_cell) in enumerate(tables[:3]):
+        first_cell = first_cell.strip()[:50]
+        print(f'Table {i+1}: {rows} rows x {cols} cols | First cell: {first_cell}')
+
+
+if __name__ == '__main__':
+    run_check_docx(iter_body('main_word.docx'))
@@ -1,22 +1,35 @@
-from docx import Document
-doc = Document('main_word.docx')
+from docx_fast import iter_body
 
-# Print the first 60 paragraphs with index, style, and text
-for i, p in enumerate(doc.paragraphs[:80]):
-    text = p.text.strip()
-    if text:
-        preview = text[:70].replace('\n', ' | ')
-        print(f'{i:4d} [{p.style.name:12s}] {preview}')
-    else:
-        print(f'{i:4d} [{p.style.name:12s}] (empty)')
-    if i == 79:
-        break
 
-print('\n\n--- Heading 1 positions ---')
-for i, p in enumerate(doc.paragraphs):
-    if p.style.name == 'Heading 1':
-        print(f'{i:4d} {p.text.strip()[:60]}')
+def run_check_structure(blocks):
+    """Paragraph outline and Heading 1 positions for the iter_body() `blocks`."""
+    # Print the first 60 paragraphs with index, style, and text;
+    # Heading 1 positions are collected in the same pass
+    headings1, n_paras, n_tables = [], 0, 0
+    for kind, info in blocks:
+        if kind == 'tbl':
+            n_tables += 1
+            continue
+        n_paras += 1
+        i, style, text, _, _ = info
+        if style == 'Heading 1':
+            headings1.append((i, text))
+        if i < 80:
+            text = text.strip()
+            if text:
+                preview = text[:70].replace('\n', ' | ')
+                print(f'{i:4d} [{style:12s}] {preview}')
+            else:
+                print(f'{i:4d} [{style:12s}] (empty)')
 
-print('\n--- Total ---')
-print(f'Paragraphs: {len(doc.paragraphs)}')
-print(f'Tables: {len(doc.tables)}')
+    print('\n\n--- Heading 1 positions ---')
+    for i, text in headings1:
+        print(f'{i:4d} {text.strip()[:60]}')
+
+    print('\n--- Total ---')
+    print(f'Paragraphs: {n_paras}')
+    print(f'Tables: {n_tables}')
+
+
+if __name__ == '__main__':
+    run_check_structure(iter_body('main_word.docx'))
@@ -1,26 +1,35 @@
-from docx import Document
-doc = Document('main_word.docx')
+from collections import Counter, defaultdict
+from docx_fast import iter_body, paragraphs_of
 
-# Check all unique styles used
-styles = {}
-for p in doc.paragraphs:
-    s = p.style.name
-    if s not in styles:
-        styles[s] = []
-    if len(styles[s]) < 3 and p.text.strip():
-        styles[s].append(p.text.strip()[:60])
 
-print("Styles used in document:")
-for s, examples in sorted(styles.items()):
-    print(f"\n  [{s}] ({sum(1 for p in doc.paragraphs if p.style.name == s)} paragraphs)")
-    for e in examples:
-        print(f"    -> {e}")
+def run_check_styles(blocks):
+    """Styles in use, with examples, and RTL on the first paragraphs of `blocks`."""
+    # Check all unique styles used, and RTL on the first few paragraphs, in one pass
+    styles = defaultdict(list)
+    counter = Counter()
+    rtl_preview = []
+    for idx, s, text, has_bidi, _ in paragraphs_of(blocks):
+        counter[s] += 1
+        bucket = styles[s]
+        if len(bucket) < 3:
+            txt = text.strip()
+            if txt:
+                bucket.append(txt[:60])
+        if idx < 5:
+            rtl_preview.append((has_bidi, text))
 
-# Check RTL in paragraph properties
-print("\n\nRTL check on first few paragraphs:")
-from docx.oxml.ns import qn
-for p in doc.paragraphs[:5]:
-    ppr = p._element.find(qn('w:pPr'))
-    bidi = ppr.find(qn('w:bidi')) if ppr is not None else None
-    text = p.text.strip()[:50] if p.text.strip() else "(empty)"
-    print(f"  bidi={'yes' if bidi is not None else 'no'} | {text}")
+    print("Styles used in document:")
+    for s, examples in sorted(styles.items()):
+        print(f"\n  [{s}] ({counter[s]} paragraphs)")
+        for e in examples:
+            print(f"    -> {e}")
+
+    # Check RTL in paragraph properties
+    print("\n\nRTL check on first few paragraphs:")
+    for has_bidi, text in rtl_preview:
+        text = text.strip()[:50] if text.strip() else "(empty)"
+        print(f"  bidi={'yes' if has_bidi else 'no'} | {text}")
+
+
+if __name__ == '__main__':
+    run_check_styles(iter_body('main_word.docx'))
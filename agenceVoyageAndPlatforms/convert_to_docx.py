@@ -2,13 +2,16 @@
 """
 Convert Arabic LaTeX thesis to DOCX with proper RTL and Arabic font support.
 Steps:
-1. Consolidate all .tex files into one cleaned LaTeX file
+1. Locate the document body in main.tex
 2. Create a reference DOCX template with RTL/Arabic settings
-3. Run pandoc to convert
+3. Clean the body file by file (following \\input{}) and stream it into pandoc
+   (--debug writes it to main_pandoc.tex and converts from there instead)
 """
 
 import re
 import os
+import argparse
+import functools
 import subprocess
 
 BASE = os.path.dirname(os.path.abspath(__file__))
@@ -50,23 +53,41 @@ CITATIONS = {
 }
 
 
-def resolve_inputs(content, base_dir):
-    """Recursively resolve \\input{} commands."""
-    def replace_input(match):
+INPUT_RE = re.compile(r'\\input\{([^}]+)\}')
+
+
+@functools.lru_cache(maxsize=None)
+def _read_tex(filepath):
+    """Read a .tex file once; repeated \\input{} of the same file hits the cache."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def iter_tex_chunks(content, base_dir):
+    """Yield `content` in pieces, depth-first through its \\input{} files.
+
+    Text between \\input{} commands is yielded as-is; each existing input is
+    replaced by the chunks of that file, recursively. Inputs that don't exist
+    are yielded verbatim.
+    """
+    last = 0
+    for match in INPUT_RE.finditer(content):
         filename = match.group(1)
         if not filename.endswith('.tex'):
             filename += '.tex'
         filepath = os.path.join(base_dir, filename)
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
-        return match.group(0)
+            if match.start() > last:
+                yield content[last:match.start()]
+            yield from iter_tex_chunks(_read_tex(filepath), base_dir)
+            last = match.end()
+    if last < len(content):
+        yield content[last:]
 
-    prev = None
-    while prev != content:
-        prev = content
-        content = re.sub(r'\\input\{([^}]+)\}', replace_input, content)
-    return content
+
+def resolve_inputs(content, base_dir):
+    """Recursively resolve \\input{} commands."""
+    return ''.join(iter_tex_chunks(content, base_dir))
 
 
 def replace_cite(match):
@@ -75,212 +96,323 @@ def replace_cite(match):
     return f'({name})'
 
 
+# ─── Precompiled clean-up patterns ────────────────────────────────────────
+TEXTENGLISH_RE = re.compile(r'\\textenglish\{([^}]*)\}')
+PARENCITE_RE = re.compile(r'\\parencite\{([^}]*)\}')
+
+# Visual spacing / page / font size / layout commands, all removed in one pass
+LAYOUT_RE = re.compile('|'.join([
+    r'\\vspace\*?\{[^}]*\}',
+    r'\\thispagestyle\{[^}]*\}',
+    r'\\pagenumbering\{[^}]*\}',
+    r'\\markboth\{[^}]*\}\{[^}]*\}',
+    r'\\addcontentsline\{[^}]*\}\{[^}]*\}\{[^}]*\}',
+    r'\\setlength\{[^}]*\}\{[^}]*\}',
+    r'\\renewcommand\{[^}]*\}\{[^}]*\}',
+    r'\\(?:vfill|newpage|blankpage|tableofcontents|listoftables|listoffigures'
+    r'|centering|hfill)',
+    r'\\(?:Huge|LARGE|Large|large|normalsize|small|footnotesize|scriptsize|tiny)\b',
+]))
+LINEBREAK_CM_RE = re.compile(r'\\\\\[[\d.]+cm\]')
+
+# minipage, flushleft, flushright, titlepage wrappers (content is kept)
+_ENVS = r'(?:minipage|flushright|flushleft|titlepage)'
+ENV_BEGIN_RE = re.compile(rf'\\begin\{{{_ENVS}\}}(?:\[[^\]]*\])?(?:\{{[^}}]*\}})?')
+ENV_END_RE = re.compile(rf'\\end\{{{_ENVS}\}}')
+
+FCOLORBOX_RE = re.compile(r'\\fcolorbox\{[^}]*\}\{[^}]*\}\{')
+MULTIROW_RE = re.compile(r'\\multirow\{[^}]*\}\{[^}]*\}\{')
+LABEL_RE = re.compile(r'\\label\{[^}]*\}')
+TABLE_REF_RE = re.compile(r'الجدول \\ref\{[^}]*\}')
+REF_RE = re.compile(r'\\ref\{[^}]*\}')
+CLINE_RE = re.compile(r'\\cline\{[^}]*\}')
+LDOTS_RE = re.compile(r'\\ldots')
+FLOAT_H_RE = re.compile(r'\[H\]')
+# A full-line comment is a special case of an unescaped % running to end of line
+COMMENT_RE = re.compile(r'(?<!\\)%.*$', re.MULTILINE)
+BIBLIOGRAPHY_RE = re.compile(r'\\printbibliography(\[[^\]]*\])?')
+PARBOX_RE = re.compile(r'\\parbox\{[^}]*\}\{')
+RIGHTARROW_RE = re.compile(r'\$\\rightarrow\$')
+TRIANGLE_RE = re.compile(r'\$\\blacktriangleright\$')
+BLANK_LINES_RE = re.compile(r'\n{4,}')
+BRACE_RE = re.compile(r'[{}]')
+
+
+def unwrap_braced(text, prefix_re):
+    """Replace every `prefix{content}` with its content, honouring nested braces.
+
+    `prefix_re` must end with the opening brace of the kept argument. The text
+    is scanned once left to right; the content is unwrapped recursively.
+    """
+    out = []
+    last = 0
+    while True:
+        m = prefix_re.search(text, last)
+        if not m:
+            break
+        # Find the matching closing brace
+        depth = 1
+        pos = len(text)  # unbalanced: runs to the end of the text
+        for b in BRACE_RE.finditer(text, m.end()):
+            depth += 1 if b.group() == '{' else -1
+            if depth == 0:
+                pos = b.end()
+                break
+        out.append(text[last:m.start()])
+        out.append(unwrap_braced(text[m.end():pos - 1], prefix_re))
+        last = pos
+    out.append(text[last:])
+    return ''.join(out)
+
+
 def clean_latex(body):
     """Remove XeLaTeX-specific and visual-only commands, keep structure."""
 
+    # Each single-purpose pass is guarded by a plain substring test: `in` is a
+    # C-level scan, far cheaper than running a regex over a body it can't match.
+
     # Replace \textenglish{...} → keep content
-    body = re.sub(r'\\textenglish\{([^}]*)\}', r'\1', body)
+    if '\\textenglish' in body:
+        body = TEXTENGLISH_RE.sub(r'\1', body)
 
     # Replace \parencite{...} → (Author, Year)
-    body = re.sub(r'\\parencite\{([^}]*)\}', replace_cite, body)
-
-    # Remove visual spacing / page commands
-    body = re.sub(r'\\vspace\*?\{[^}]*\}', '', body)
-    body = re.sub(r'\\vfill', '', body)
-    body = re.sub(r'\\newpage', '', body)
-    body = re.sub(r'\\thispagestyle\{[^}]*\}', '', body)
-    body = re.sub(r'\\pagenumbering\{[^}]*\}', '', body)
-    body = re.sub(r'\\markboth\{[^}]*\}\{[^}]*\}', '', body)
-    body = re.sub(r'\\addcontentsline\{[^}]*\}\{[^}]*\}\{[^}]*\}', '', body)
-    body = re.sub(r'\\blankpage', '', body)
-    body = re.sub(r'\\tableofcontents', '', body)
-    body = re.sub(r'\\listoftables', '', body)
-    body = re.sub(r'\\listoffigures', '', body)
-    body = re.sub(r'\\setlength\{[^}]*\}\{[^}]*\}', '', body)
-    body = re.sub(r'\\renewcommand\{[^}]*\}\{[^}]*\}', '', body)
-    body = re.sub(r'\\centering', '', body)
-
-    # Remove font size commands
-    for cmd in ['Huge', 'LARGE', 'Large', 'large', 'normalsize', 'small',
-                'footnotesize', 'scriptsize', 'tiny']:
-        body = re.sub(rf'\\{cmd}\b', '', body)
-
-    # Remove layout commands
-    body = re.sub(r'\\hfill', '', body)
+    if '\\parencite' in body:
+        body = PARENCITE_RE.sub(replace_cite, body)
+
+    # Remove visual spacing / page / font size / layout commands
+    body = LAYOUT_RE.sub('', body)
     # Replace \\[0.3cm] style breaks with \\ (keep plain \\ for pandoc)
-    body = re.sub(r'\\\\\[[\d.]+cm\]', r'\\\\', body)
+    if '\\\\[' in body:
+        body = LINEBREAK_CM_RE.sub(r'\\\\', body)
 
     # Remove minipage, flushleft, flushright, titlepage (keep content)
-    for env in ['minipage', 'flushright', 'flushleft', 'titlepage']:
-        body = re.sub(rf'\\begin\{{{env}\}}(\[[^\]]*\])?\{{[^}}]*\}}', '', body)
-        body = re.sub(rf'\\begin\{{{env}\}}(\[[^\]]*\])?', '', body)
-        body = re.sub(rf'\\end\{{{env}\}}', '', body)
+    if '\\begin{' in body:
+        body = ENV_BEGIN_RE.sub('', body)
+    if '\\end{' in body:
+        body = ENV_END_RE.sub('', body)
 
     # Remove \fcolorbox{rule}{bg}{content} → content
-    # Use a function to handle nested braces properly
-    def remove_fcolorbox(text):
-        pattern = r'\\fcolorbox\{[^}]*\}\{[^}]*\}\{'
-        while True:
-            m = re.search(pattern, text)
-            if not m:
-                break
-            start = m.start()
-            # Find the matching closing brace
-            brace_start = m.end() - 1  # position of the opening {
-            depth = 1
-            pos = m.end()
-            while pos < len(text) and depth > 0:
-                if text[pos] == '{':
-                    depth += 1
-                elif text[pos] == '}':
-                    depth -= 1
-                pos += 1
-            # Extract content between braces
-            content = text[brace_start + 1:pos - 1]
-            text = text[:start] + content + text[pos:]
-        return text
-    body = remove_fcolorbox(body)
+    if '\\fcolorbox' in body:
+        body = unwrap_braced(body, FCOLORBOX_RE)
 
     # Remove \label and \ref
-    body = re.sub(r'\\label\{[^}]*\}', '', body)
-    body = re.sub(r'الجدول \\ref\{[^}]*\}', 'الجدول التالي', body)
-    body = re.sub(r'\\ref\{[^}]*\}', '', body)
+    if '\\label' in body:
+        body = LABEL_RE.sub('', body)
+    if '\\ref' in body:
+        body = TABLE_REF_RE.sub('الجدول التالي', body)
+        body = REF_RE.sub('', body)
 
     # Handle multirow: \multirow{n}{width}{text} → text
-    def remove_multirow(text):
-        pattern = r'\\multirow\{[^}]*\}\{[^}]*\}\{'
-        while True:
-            m = re.search(pattern, text)
-            if not m:
-                break
-            start = m.start()
-            depth = 1
-            pos = m.end()
-            while pos < len(text) and depth > 0:
-                if text[pos] == '{':
-                    depth += 1
-                elif text[pos] == '}':
-                    depth -= 1
-                pos += 1
-            content = text[m.end():pos - 1]
-            text = text[:start] + content + text[pos:]
-        return text
-    body = remove_multirow(body)
+    if '\\multirow' in body:
+        body = unwrap_braced(body, MULTIROW_RE)
 
     # \cline{...} → \hline (simplified)
-    body = re.sub(r'\\cline\{[^}]*\}', r'\\hline', body)
+    if '\\cline' in body:
+        body = CLINE_RE.sub(r'\\hline', body)
 
     # Replace \ldots
-    body = re.sub(r'\\ldots', '...', body)
+    if '\\ldots' in body:
+        body = LDOTS_RE.sub('...', body)
 
     # Remove [H] float placement
-    body = re.sub(r'\[H\]', '', body)
+    if '[H]' in body:
+        body = FLOAT_H_RE.sub('', body)
 
-    # Remove % comment lines
-    body = re.sub(r'^%.*$', '', body, flags=re.MULTILINE)
-    # Remove inline comments (careful not to remove \%)
-    body = re.sub(r'(?<!\\)%.*$', '', body, flags=re.MULTILINE)
+    # Remove % comments, full-line and inline (careful not to remove \%)
+    if '%' in body:
+        body = COMMENT_RE.sub('', body)
 
     # printbibliography
-    body = re.sub(r'\\printbibliography(\[[^\]]*\])?', '', body)
+    if '\\printbibliography' in body:
+        body = BIBLIOGRAPHY_RE.sub('', body)
 
     # Remove \parbox
-    body = re.sub(r'\\parbox\{[^}]*\}\{', '{', body)
+    if '\\parbox' in body:
+        body = PARBOX_RE.sub('{', body)
 
     # $\rightarrow$ → →
-    body = re.sub(r'\$\\rightarrow\$', '→', body)
+    if '$\\rightarrow$' in body:
+        body = RIGHTARROW_RE.sub('→', body)
     # $\blacktriangleright$ → ►
-    body = re.sub(r'\$\\blacktriangleright\$', '►', body)
+    if '$\\blacktriangleright$' in body:
+        body = TRIANGLE_RE.sub('►', body)
 
     # Clean up multiple blank lines
-    body = re.sub(r'\n{4,}', '\n\n\n', body)
+    if '\n\n\n\n' in body:
+        body = BLANK_LINES_RE.sub('\n\n\n', body)
 
     return body
 
 
-def create_reference_docx(output_path):
-    """Create a reference DOCX with RTL and Arabic font settings."""
-    from docx import Document
-    from docx.shared import Pt, Cm
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+DOCUMENT_RE = re.compile(r'\\begin\{document\}(.*?)\\end\{document\}', re.DOTALL)
+
+# Minimal preamble pandoc understands, in place of the XeLaTeX one
+CLEAN_PREAMBLE = r"""\documentclass[a4paper,14pt]{extreport}
+\usepackage[utf8]{inputenc}
+\usepackage{longtable}
+\usepackage{booktabs}
+\usepackage{multirow}
+\usepackage{array}
+\usepackage{amssymb}
+\usepackage{graphicx}
+\usepackage{float}
+\usepackage[shortlabels]{enumitem}
+\begin{document}
+"""
+
+
+def open_braces(text, depth=0):
+    """Return how many `{` are still unclosed after `text`, starting at `depth`.
+
+    Stray closing braces are ignored, so the count is the number of braces
+    that a brace-matching rule would still have to look past the end for.
+    """
+    for b in BRACE_RE.finditer(text):
+        if b.group() == '{':
+            depth += 1
+        elif depth:
+            depth -= 1
+    return depth
+
+
+def stream_clean(main_tex_path, out_fh):
+    """Clean the document body file by file, writing each piece to `out_fh`.
+
+    Only the top-level file's \\begin{document}...\\end{document} is taken;
+    the files it \\input{}s are visited depth-first, so the consolidated thesis
+    is never held in memory. clean_latex() rules can span an \\input{}
+    boundary: a wrapper such as \\fcolorbox{..}{..}{\\input{x}} or
+    \\textenglish{\\input{x}}, or a comment like `% \\input{x}` that also
+    swallows the first line of x. Chunks are therefore only cleaned once the
+    text gathered so far ends a line with every brace closed; until then the
+    next chunk is joined on and the whole is cleaned together, exactly as if
+    the inputs had been resolved first. Newlines at the edges of the cleaned
+    pieces are held back so the blank-line collapse still works across them.
+    Returns the number of characters written, or None if there is no
+    document environment.
+    """
+    doc_match = DOCUMENT_RE.search(_read_tex(main_tex_path))
+    if not doc_match:
+        return None
+    written = 0
+    pending = 0  # newlines at the end of the previous pieces, not yet written
+    chunks = []  # raw chunks not cleaned yet
+    depth = 0
+
+    def flush():
+        nonlocal written, pending
+        cleaned = clean_latex(''.join(chunks))
+        chunks.clear()
+        text = cleaned.lstrip('\n')
+        pending += len(cleaned) - len(text)
+        if not text:
+            return
+        body = text.rstrip('\n')
+        piece = '\n' * min(pending, 3) + body
+        out_fh.write(piece)
+        written += len(piece)
+        pending = len(text) - len(body)
+
+    for chunk in iter_tex_chunks(doc_match.group(1), os.path.dirname(main_tex_path)):
+        chunks.append(chunk)
+        depth = open_braces(chunk, depth)
+        if not depth and chunk.endswith('\n'):
+            flush()
+    if chunks:
+        flush()
+    out_fh.write('\n' * min(pending, 3))
+    return written + min(pending, 3)
+
+
+def write_pandoc_source(main_tex_path, out_fh):
+    """Write the complete pandoc-compatible LaTeX document; returns the body size."""
+    out_fh.write(CLEAN_PREAMBLE)
+    written = stream_clean(main_tex_path, out_fh)
+    out_fh.write('\n\\end{document}\n')
+    return written
+
+
+def run_pandoc(args, main_tex_path=None):
+    """Run pandoc with `args` and return the CompletedProcess.
+
+    With `main_tex_path`, the cleaned document is streamed into pandoc's stdin
+    (pandoc reads stdin when no input file is given) instead of going through
+    a temporary file.
+    """
+    cmd = ['pandoc', *args]
+    if main_tex_path is None:
+        return subprocess.run(cmd, capture_output=True, encoding='utf-8')
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, encoding='utf-8') as proc:
+        try:
+            write_pandoc_source(main_tex_path, proc.stdin)
+        except BrokenPipeError:
+            pass  # pandoc exited early; its stderr says why
+        except BaseException:
+            # e.g. an unreadable \input{} file: don't leave pandoc converting
+            # half a document; leaving the with-block closes the pipes and waits
+            proc.kill()
+            raise
+        out, err = proc.communicate()  # closes stdin, then waits
+    return subprocess.CompletedProcess(cmd, proc.returncode, out, err)
+
+
+HEADING_SIZES = {1: 22, 2: 18, 3: 16, 4: 14}
+
+
+def _apply_rtl_style(style, pt, cs_font='Traditional Arabic'):
+    """Give a style the Arabic font and size, plus RTL run and paragraph settings."""
+    from docx.shared import Pt
     from docx.oxml.ns import qn
     from docx.oxml import OxmlElement
 
-    doc = Document()
-
-    # Set default font and RTL for the whole document
-    style = doc.styles['Normal']
     font = style.font
-    font.name = 'Traditional Arabic'
-    font.size = Pt(14)
+    font.name = cs_font
+    font.size = Pt(pt)
 
-    # Set RTL for Arabic font
-    rpr = style.element.get_or_add_rPr()
+    element = style.element
+    rpr = element.get_or_add_rPr()
 
     # Set Arabic font (cs = complex script)
-    cs_font = OxmlElement('w:rFonts')
-    cs_font.set(qn('w:cs'), 'Traditional Arabic')
-    cs_font.set(qn('w:ascii'), 'Times New Roman')
-    cs_font.set(qn('w:hAnsi'), 'Times New Roman')
-    rpr.append(cs_font)
+    rfonts = OxmlElement('w:rFonts')
+    rfonts.set(qn('w:cs'), cs_font)
+    rfonts.set(qn('w:ascii'), 'Times New Roman')
+    rfonts.set(qn('w:hAnsi'), 'Times New Roman')
+    rpr.append(rfonts)
 
-    # Set cs font size
+    # Set cs font size (half-points)
     sz_cs = OxmlElement('w:szCs')
-    sz_cs.set(qn('w:val'), '28')  # 14pt = 28 half-points
+    sz_cs.set(qn('w:val'), str(pt * 2))
     rpr.append(sz_cs)
 
     # Set RTL
-    rtl = OxmlElement('w:rtl')
-    rpr.append(rtl)
-
-    # Set bidi on paragraph format
-    ppr = style.element.get_or_add_pPr()
-    bidi = OxmlElement('w:bidi')
-    ppr.append(bidi)
+    rpr.append(OxmlElement('w:rtl'))
 
-    # Set RTL paragraph alignment
+    # Set bidi and RTL paragraph alignment
+    ppr = element.get_or_add_pPr()
+    ppr.append(OxmlElement('w:bidi'))
     jc = OxmlElement('w:jc')
     jc.set(qn('w:val'), 'right')
     ppr.append(jc)
 
+
+def create_reference_docx(output_path):
+    """Create a reference DOCX with RTL and Arabic font settings."""
+    from docx import Document
+    from docx.shared import Cm
+    from docx.oxml import OxmlElement
+
+    doc = Document()
+    styles = doc.styles
+
+    # Set default font and RTL for the whole document
+    _apply_rtl_style(styles['Normal'], 14)
+
     # Configure heading styles
-    for level in range(1, 5):
+    for level, pt in HEADING_SIZES.items():
         style_name = f'Heading {level}'
-        if style_name in doc.styles:
-            h_style = doc.styles[style_name]
-            h_font = h_style.font
-            h_font.name = 'Traditional Arabic'
-            if level == 1:
-                h_font.size = Pt(22)
-            elif level == 2:
-                h_font.size = Pt(18)
-            elif level == 3:
-                h_font.size = Pt(16)
-            else:
-                h_font.size = Pt(14)
-
-            h_rpr = h_style.element.get_or_add_rPr()
-            h_cs_font = OxmlElement('w:rFonts')
-            h_cs_font.set(qn('w:cs'), 'Traditional Arabic')
-            h_cs_font.set(qn('w:ascii'), 'Times New Roman')
-            h_cs_font.set(qn('w:hAnsi'), 'Times New Roman')
-            h_rpr.append(h_cs_font)
-
-            h_rtl = OxmlElement('w:rtl')
-            h_rpr.append(h_rtl)
-
-            # Set cs size
-            h_sz_cs = OxmlElement('w:szCs')
-            h_sz_cs.set(qn('w:val'), str(h_font.size.pt * 2) if h_font.size else '28')
-            h_rpr.append(h_sz_cs)
-
-            h_ppr = h_style.element.get_or_add_pPr()
-            h_bidi = OxmlElement('w:bidi')
-            h_ppr.append(h_bidi)
-
-            h_jc = OxmlElement('w:jc')
-            h_jc.set(qn('w:val'), 'right')
-            h_ppr.append(h_jc)
+        if style_name in styles:
+            _apply_rtl_style(styles[style_name], pt)
 
     # Set document-level RTL
     sect_pr = doc.sections[0]._sectPr
@@ -302,63 +434,38 @@ def create_reference_docx(output_path):
     print(f"  Created reference DOCX: {output_path}")
 
 
-def main():
+def main(debug=False):
     print("=" * 60)
     print("  Arabic LaTeX → DOCX Converter")
     print("=" * 60)
 
-    # Step 1: Read and consolidate LaTeX
-    print("\n[1/4] Reading and consolidating LaTeX files...")
+    # Step 1: Locate the document body (\\input{} files are read lazily later)
+    print("\n[1/3] Reading LaTeX files...")
     main_tex_path = os.path.join(BASE, 'main.tex')
-    with open(main_tex_path, 'r', encoding='utf-8') as f:
-        main_content = f.read()
-
-    full_content = resolve_inputs(main_content, BASE)
-
-    # Extract body
-    doc_match = re.search(
-        r'\\begin\{document\}(.*?)\\end\{document\}',
-        full_content, re.DOTALL
-    )
-    if not doc_match:
+    if not DOCUMENT_RE.search(_read_tex(main_tex_path)):
         print("ERROR: Could not find \\begin{document}...\\end{document}")
         return
-    body = doc_match.group(1)
-
-    # Step 2: Clean LaTeX
-    print("[2/4] Cleaning LaTeX for pandoc compatibility...")
-    body = clean_latex(body)
 
-    # Write cleaned pandoc-compatible LaTeX
-    clean_preamble = r"""\documentclass[a4paper,14pt]{extreport}
-\usepackage[utf8]{inputenc}
-\usepackage{longtable}
-\usepackage{booktabs}
-\usepackage{multirow}
-\usepackage{array}
-\usepackage{amssymb}
-\usepackage{graphicx}
-\usepackage{float}
-\usepackage[shortlabels]{enumitem}
-\begin{document}
-"""
-
-    pandoc_tex = os.path.join(BASE, 'main_pandoc.tex')
-    with open(pandoc_tex, 'w', encoding='utf-8') as f:
-        f.write(clean_preamble + body + '\n\\end{document}\n')
-    print(f"  Written: main_pandoc.tex ({len(body)} chars)")
-
-    # Step 3: Create reference DOCX with RTL/Arabic settings
-    print("[3/4] Creating reference DOCX template with Arabic/RTL settings...")
+    # Step 2: Create reference DOCX with RTL/Arabic settings
+    print("[2/3] Creating reference DOCX template with Arabic/RTL settings...")
     ref_docx = os.path.join(BASE, 'reference.docx')
     create_reference_docx(ref_docx)
 
-    # Step 4: Run pandoc
-    print("[4/4] Converting to DOCX with pandoc...")
+    # Step 3: Clean the LaTeX file by file and run pandoc on it
+    print("[3/3] Cleaning LaTeX and converting to DOCX with pandoc...")
+    if debug:
+        # Keep the cleaned LaTeX on disk for inspection and convert from the file
+        pandoc_tex = os.path.join(BASE, 'main_pandoc.tex')
+        with open(pandoc_tex, 'w', encoding='utf-8') as f:
+            written = write_pandoc_source(main_tex_path, f)
+        print(f"  Written: main_pandoc.tex ({written} chars)")
+        pandoc_src, stream_from = [pandoc_tex], None
+    else:
+        pandoc_src, stream_from = [], main_tex_path
+
     output_docx = os.path.join(BASE, 'main_word.docx')
-    cmd = [
-        'pandoc',
-        pandoc_tex,
+    args = [
+        *pandoc_src,
         '-f', 'latex',
         '-t', 'docx',
         '-o', output_docx,
@@ -368,20 +475,19 @@ def main():
         '--wrap=none',
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = run_pandoc(args, stream_from)
     if result.returncode != 0:
         print(f"  pandoc stderr: {result.stderr}")
         # Try again without some options if it fails
         print("  Retrying with simpler options...")
-        cmd2 = [
-            'pandoc',
-            pandoc_tex,
+        args2 = [
+            *pandoc_src,
             '-f', 'latex',
             '-t', 'docx',
             '-o', output_docx,
             '--reference-doc', ref_docx,
         ]
-        result2 = subprocess.run(cmd2, capture_output=True, text=True)
+        result2 = run_pandoc(args2, stream_from)
         if result2.returncode != 0:
             print(f"  pandoc error: {result2.stderr}")
             return
@@ -408,4 +514,7 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Convert the Arabic LaTeX thesis to DOCX.')
+    parser.add_argument('--debug', action='store_true',
+                        help='also write the cleaned LaTeX to main_pandoc.tex and convert from it')
+    main(debug=parser.parse_args().debug)
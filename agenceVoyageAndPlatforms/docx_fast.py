@@ -0,0 +1,151 @@
+"""Read-only streaming access to a DOCX body, without building a python-docx Document.
+
+Written for the check scripts, but also part of the build pipeline:
+style_docx.py takes paragraph_styles() and paragraph_text() from here to
+pick the styling of each body paragraph, so changing either of them changes
+main_word_styled.docx, not just the check reports.
+"""
+
+import functools
+import zipfile
+from lxml import etree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+NS = {'w': W_NS}
+W = f'{{{W_NS}}}'
+
+W_BODY = f'{W}body'
+W_P = f'{W}p'
+W_TBL = f'{W}tbl'
+W_T = f'{W}t'
+W_BR = f'{W}br'
+W_TYPE = f'{W}type'
+
+# Same UI-name aliases python-docx applies to built-in styles ('heading 1' → 'Heading 1')
+_UI_STYLE_NAMES = {'caption': 'Caption', 'footer': 'Footer', 'header': 'Header',
+                   **{f'heading {i}': f'Heading {i}' for i in range(1, 10)}}
+
+# Text equivalents of the run inner-content python-docx includes in paragraph.text
+_RUN_TEXT = {f'{W}tab': '\t', f'{W}ptab': '\t', f'{W}cr': '\n', f'{W}noBreakHyphen': '-'}
+
+_STYLE_DEFS = etree.XPath('w:style[@w:type="paragraph"]', namespaces=NS)
+_P_STYLE = etree.XPath('string(w:pPr/w:pStyle/@w:val)', namespaces=NS)
+_P_JC = etree.XPath('string(w:pPr/w:jc/@w:val)', namespaces=NS)
+_P_BIDI = etree.XPath('boolean(w:pPr/w:bidi)', namespaces=NS)
+_RUN_CONTENT = etree.XPath(
+    '(w:r | w:hyperlink/w:r)/*[self::w:t or self::w:tab or self::w:br or self::w:cr'
+    ' or self::w:noBreakHyphen or self::w:ptab]', namespaces=NS)
+_TBL_ROWS = etree.XPath('count(w:tr)', namespaces=NS)
+_TBL_COLS = etree.XPath('count(w:tblGrid/w:gridCol)', namespaces=NS)
+_FIRST_CELL_PARAS = etree.XPath('w:tr[1]/w:tc[1]/w:p', namespaces=NS)
+
+
+def paragraph_styles(root):
+    """Return ({styleId: name}, default name, {name: w:style}) for the paragraph styles
+    under the w:styles element `root`."""
+    names = {}
+    elements = {}
+    default = None
+    for s in _STYLE_DEFS(root):
+        name = s.find(f'{W}name')
+        name = name.get(f'{W}val') if name is not None else None
+        name = _UI_STYLE_NAMES.get(name, name)
+        names[s.get(f'{W}styleId')] = name
+        elements[name] = s
+        if s.get(f'{W}default') in ('1', 'true', 'on'):
+            default = name
+    return names, default, elements
+
+
+def read_styles(z):
+    """paragraph_styles() of the word/styles.xml in the open zip `z`."""
+    return paragraph_styles(etree.fromstring(z.read('word/styles.xml')))
+
+
+def load_styles(path):
+    """read_styles() for the DOCX at `path`."""
+    with zipfile.ZipFile(path) as z:
+        return read_styles(z)
+
+
+def paragraph_text(p):
+    """Text of a w:p element, matching python-docx's Paragraph.text."""
+    parts = []
+    for e in _RUN_CONTENT(p):
+        tag = e.tag
+        if tag == W_T:
+            parts.append(e.text or '')
+        elif tag == W_BR:
+            if e.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            parts.append(_RUN_TEXT[tag])
+    return ''.join(parts)
+
+
+def _iter_blocks(z):
+    """Stream the top-level w:p / w:tbl elements of the body.
+
+    Each element is cleared, and its already-seen siblings dropped, as soon as
+    the caller asks for the next one, so memory stays at one block.
+    """
+    with z.open('word/document.xml') as f:
+        for _, el in etree.iterparse(f, events=('end',), tag=(W_P, W_TBL)):
+            parent = el.getparent()
+            if parent is None or parent.tag != W_BODY:
+                continue
+            yield el
+            el.clear(keep_tail=True)
+            while el.getprevious() is not None:
+                del parent[0]
+
+
+def iter_paragraph_xml(path):
+    """Stream (idx, style_val, w:p element, text) for every body paragraph.
+
+    `style_val` is the raw w:pStyle/@w:val (None when absent). The element is
+    only valid until the next item is requested.
+    """
+    with zipfile.ZipFile(path) as z:
+        idx = 0
+        for el in _iter_blocks(z):
+            if el.tag == W_P:
+                yield idx, _P_STYLE(el) or None, el, paragraph_text(el)
+                idx += 1
+
+
+def iter_body(path):
+    """Stream the top-level blocks of the body.
+
+    Yields ('p', (idx, style, text, has_bidi, jc)) for paragraphs and
+    ('tbl', (rows, cols, first_cell_text)) for tables.
+    """
+    with zipfile.ZipFile(path) as z:
+        names, default, _ = read_styles(z)
+        idx = 0
+        for el in _iter_blocks(z):
+            if el.tag == W_P:
+                style = names.get(_P_STYLE(el) or None, default)
+                yield 'p', (idx, style, paragraph_text(el), _P_BIDI(el), _P_JC(el) or None)
+                idx += 1
+            else:
+                first = '\n'.join(paragraph_text(p) for p in _FIRST_CELL_PARAS(el))
+                yield 'tbl', (int(_TBL_ROWS(el)), int(_TBL_COLS(el)), first)
+
+
+def paragraphs_of(blocks):
+    """Keep the paragraph items of iter_body()-style `blocks`."""
+    for kind, info in blocks:
+        if kind == 'p':
+            yield info
+
+
+def iter_paragraphs(path):
+    """Stream (idx, style, text, has_bidi, jc) for every body paragraph."""
+    return paragraphs_of(iter_body(path))
+
+
+@functools.lru_cache(maxsize=None)
+def load_body(path):
+    """iter_body() materialized once per path, for several checks to share."""
+    return tuple(iter_body(path))
@@ -7,25 +7,29 @@ body = doc.element.body
 ns = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
 dns = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
 wns = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+TTAG = f'{ns}t'
+DRAWING_TAG = f'{wns}drawing'
+BLIP_TAG = f'{dns}blip'
 
 children = list(body)
 for i, child in enumerate(children):
     tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
     text = ''
     if tag == 'p':
-        for t in child.iter(f'{ns}t'):
-            text += (t.text or '')
-        text = text[:80]
+        text = ''.join(t.text or '' for t in child.iter(TTAG))[:80]
     elif tag == 'tbl':
         text = '[TABLE]'
     elif tag == 'sectPr':
         text = '[SECTION]'
     
-    # Check for drawings
-    from lxml import etree
-    drawings = list(child.iter(f'{wns}drawing'))
-    blips = list(child.iter(f'{dns}blip'))
-    img = f' [DRAW:{len(drawings)} BLIP:{len(blips)}]' if drawings or blips else ''
+    # Check for drawings (one walk over the subtree for both counts)
+    drawings = blips = 0
+    for el in child.iter(DRAWING_TAG, BLIP_TAG):
+        if el.tag == DRAWING_TAG:
+            drawings += 1
+        else:
+            blips += 1
+    img = f' [DRAW:{drawings} BLIP:{blips}]' if drawings or blips else ''
     
     print(f'[{i:3d}] {tag:10s} | {text}{img}')
 
@@ -9,58 +9,208 @@ Build the final DOCX from scratch:
   6. Footnotes for references (per-page)
 """
 
-import os, copy, shutil
+import os, io, copy, posixpath, zipfile
 from docx import Document
 from docx.shared import Pt, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.text.paragraph import Paragraph
+from docx.oxml.ns import qn, nsmap
+from docx.oxml import OxmlElement, parse_xml
+from docx.opc.part import Part
+from docx.image.exceptions import UnrecognizedImageError
+from lxml import etree
+from lxml.etree import SubElement
+
+# python-docx's zip writer is private API. _save() only swaps in
+# _write_part() while it still has the write() being replaced (checked
+# here) and the _zipf it writes to (checked per call); otherwise the figures
+# are simply deflated like everything else by the stock doc.save()
+try:
+    from docx.opc.phys_pkg import _ZipPkgWriter
+except ImportError:
+    _ZipPkgWriter = None
+_STOCK_WRITE = getattr(_ZipPkgWriter, 'write', None)
+
+# Optional drop-in deflate (SIMD-accelerated) for writing the final DOCX;
+# the stdlib zlib is used when neither is installed. zlib-ng first: at its
+# default level it matches zlib's output size. ISA-L only has levels 0-3, and
+# zipfile then asks for its default (2), which is faster still but ~30% larger.
+try:
+    from zlib_ng import zlib_ng as fast_zlib
+except ImportError:
+    try:
+        from isal import isal_zlib as fast_zlib
+    except ImportError:
+        fast_zlib = None
+
+# Embedded figures are already compressed: a second deflate pass costs CPU for
+# ~0 gain. (Not docProps/thumbnail.jpeg — python-docx's blank placeholder
+# deflates to an eighth of its size.)
+STORED_EXTS = ('.png', '.jpg', '.jpeg', '.gif')
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 BODY_DOCX = os.path.join(BASE, 'main_word_styled.docx')
 OUTPUT = os.path.join(BASE, 'main_word_final.docx')
 
+# Clark names, resolved once here instead of by qn() at every call site
+QN_RFONTS = qn('w:rFonts')
+QN_CS = qn('w:cs')
+QN_ASCII = qn('w:ascii')
+QN_HANSI = qn('w:hAnsi')
+QN_SZCS = qn('w:szCs')
+QN_BCS = qn('w:bCs')
+QN_B = qn('w:b')
+QN_I = qn('w:i')
+QN_R = qn('w:r')
+QN_RTL = qn('w:rtl')
+QN_T = qn('w:t')
+
+QN_BODY = qn('w:body')
+QN_P = qn('w:p')
+QN_PPR = qn('w:pPr')
+QN_BIDI = qn('w:bidi')
+QN_SPACING = qn('w:spacing')
+QN_BEFORE = qn('w:before')
+QN_AFTER = qn('w:after')
+QN_LINE = qn('w:line')
+QN_LINERULE = qn('w:lineRule')
+QN_JC = qn('w:jc')
+
+QN_TOP = qn('w:top')
+QN_BOTTOM = qn('w:bottom')
+QN_LEFT = qn('w:left')
+QN_RIGHT = qn('w:right')
+QN_VAL = qn('w:val')
+QN_SZ = qn('w:sz')
+QN_SPACE = qn('w:space')
+QN_COLOR = qn('w:color')
+QN_OFFSETFROM = qn('w:offsetFrom')
+
+QN_TBL = qn('w:tbl')
+QN_TBLPR = qn('w:tblPr')
+QN_TBLW = qn('w:tblW')
+QN_W = qn('w:w')
+QN_TYPE = qn('w:type')
+
+QN_SECTPR = qn('w:sectPr')
+QN_PGSZ = qn('w:pgSz')
+QN_H = qn('w:h')
+QN_PGMAR = qn('w:pgMar')
+QN_HEADER = qn('w:header')
+QN_FOOTER = qn('w:footer')
+QN_PGNUMTYPE = qn('w:pgNumType')
+QN_START = qn('w:start')
+
+QN_FLDCHARTYPE = qn('w:fldCharType')
+QN_XML_SPACE = qn('xml:space')
+
+# Raw w:pStyle value of a paragraph ('' when unset)
+P_STYLE = etree.XPath('string(w:pPr/w:pStyle/@w:val)', namespaces={'w': nsmap['w']})
+
+# r:embed / r:link / r:id — the attributes that carry relationship ids
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+QN_REL_ATTRS = (f'{{{R_NS}}}embed', f'{{{R_NS}}}link', f'{{{R_NS}}}id')
+# Only the elements that carry one of them, instead of walking every descendant
+RID_XPATH = etree.XPath('descendant-or-self::*[@r:embed or @r:link or @r:id]',
+                        namespaces={'r': R_NS})
+
 AF = 'Traditional Arabic'
 LF = 'Times New Roman'
 
 # ─── helpers ────────────────────────────────────────────────
 
+def _rpr(fa=AF, fl=LF, sz=14, bold=False, color=None, italic=False):
+    """Build, as one XML subtree, the w:rPr that _rf() gives a fresh run."""
+    rpr = OxmlElement('w:rPr')
+    f = SubElement(rpr, QN_RFONTS)
+    f.set(QN_CS, fa); f.set(QN_ASCII, fl); f.set(QN_HANSI, fl)
+    b = SubElement(rpr, QN_B)
+    if not bold: b.set(QN_VAL, '0')
+    if italic: SubElement(rpr, QN_I)
+    if color: SubElement(rpr, QN_COLOR).set(QN_VAL, str(color))
+    half_pts = str(int(sz*2))
+    SubElement(rpr, QN_SZ).set(QN_VAL, half_pts)
+    SubElement(rpr, QN_SZCS).set(QN_VAL, half_pts)
+    if bold: SubElement(rpr, QN_BCS)
+    SubElement(rpr, QN_RTL)
+    return rpr
+
+# (fa, fl, sz, bold, color, italic) → finished w:rPr, copied onto later fresh runs
+_RPR_CACHE = {}
+
+def _fresh_rpr(fa=AF, fl=LF, sz=14, bold=False, color=None, italic=False):
+    """Copy of the cached w:rPr for a fresh run, built by _rpr() on first use."""
+    key = (fa, fl, sz, bold, color, italic)
+    rpr = _RPR_CACHE.get(key)
+    if rpr is None:
+        rpr = _RPR_CACHE[key] = _rpr(*key)
+    return copy.deepcopy(rpr)
+
 def _rf(run, fa=AF, fl=LF, sz=14, bold=False, color=None, italic=False):
     """Set font on run."""
-    rpr = run._element.get_or_add_rPr()
-    f = OxmlElement('w:rFonts')
-    f.set(qn('w:cs'), fa); f.set(qn('w:ascii'), fl); f.set(qn('w:hAnsi'), fl)
-    for o in rpr.findall(qn('w:rFonts')): rpr.remove(o)
-    rpr.insert(0, f)
+    r = run._element
+    if r.rPr is None:
+        r.insert(0, _fresh_rpr(fa, fl, sz, bold, color, italic))  # w:rPr is the first child of w:r
+        return
+    rpr = r.rPr
+    # rFonts / szCs are singletons: rewrite the existing one instead of replacing it
+    f = rpr.find(QN_RFONTS)
+    if f is None:
+        f = OxmlElement('w:rFonts'); rpr.insert(0, f)
+    else:
+        f.attrib.clear()  # drop theme fonts etc., as a fresh element would
+    f.set(QN_CS, fa); f.set(QN_ASCII, fl); f.set(QN_HANSI, fl)
     run.font.size = Pt(sz)
-    sc = OxmlElement('w:szCs'); sc.set(qn('w:val'), str(int(sz*2)))
-    for o in rpr.findall(qn('w:szCs')): rpr.remove(o)
-    rpr.append(sc)
+    sc = rpr.find(QN_SZCS)
+    if sc is None:
+        sc = OxmlElement('w:szCs'); rpr.append(sc)
+    sc.set(QN_VAL, str(int(sz*2)))
     run.font.bold = bold
     if bold:
-        if rpr.find(qn('w:bCs')) is None: rpr.append(OxmlElement('w:bCs'))
+        if rpr.find(QN_BCS) is None: rpr.append(OxmlElement('w:bCs'))
     if italic:
         run.font.italic = italic
     if color: run.font.color.rgb = color
-    if rpr.find(qn('w:rtl')) is None: rpr.append(OxmlElement('w:rtl'))
+    if rpr.find(QN_RTL) is None: rpr.append(OxmlElement('w:rtl'))
 
 def _bidi(p):
     """Set bidi on paragraph."""
     ppr = p._element.get_or_add_pPr()
-    if ppr.find(qn('w:bidi')) is None: ppr.append(OxmlElement('w:bidi'))
+    if ppr.find(QN_BIDI) is None: ppr.append(OxmlElement('w:bidi'))
+
+def _twips(pt):
+    return str(int(round(pt * 20)))
+
+# _ap() format (everything but the text) → finished w:p; the front pages reuse
+# a few formats many times, so later paragraphs are clones with new text
+_P_CACHE = {}
 
 def _ap(doc, txt, sz=14, bold=False, align=WD_ALIGN_PARAGRAPH.CENTER,
         sb=0, sa=0, color=None, ls=1.5, italic=False):
-    """Add paragraph."""
-    p = doc.add_paragraph()
-    p.alignment = align; pf = p.paragraph_format
-    pf.space_before = Pt(sb); pf.space_after = Pt(sa); pf.line_spacing = ls
-    _bidi(p)
-    if txt:
-        r = p.add_run(txt)
-        _rf(r, sz=sz, bold=bold, color=color, italic=italic)
-    return p
+    """Add paragraph.
+
+    The w:p is built directly as XML — the same pPr/run python-docx's
+    paragraph_format setters, add_run() and _rf() would produce — once per
+    format, and a copy with the text is inserted before the body sectPr.
+    """
+    key = (bool(txt), sz, bold, align, sb, sa, color, ls, italic)
+    p = _P_CACHE.get(key)
+    if p is None:
+        p = OxmlElement('w:p')
+        ppr = SubElement(p, QN_PPR)
+        sp = SubElement(ppr, QN_SPACING)
+        sp.set(QN_BEFORE, _twips(sb)); sp.set(QN_AFTER, _twips(sa))
+        sp.set(QN_LINE, str(int(round(ls * 240)))); sp.set(QN_LINERULE, 'auto')
+        SubElement(ppr, QN_JC).set(QN_VAL, align.xml_value)
+        SubElement(ppr, QN_BIDI)
+        if txt:
+            SubElement(p, QN_R).append(_fresh_rpr(sz=sz, bold=bold, color=color, italic=italic))
+        _P_CACHE[key] = p
+    p = copy.deepcopy(p)
+    if txt: p.r_lst[0].text = txt  # CT_R setter, as add_run() uses: tabs/breaks/xml:space
+    doc.element.body._insert_p(p)
+    return Paragraph(p, doc._body)
 
 def _box(p, sz=16):
     """Box border around paragraph."""
@@ -68,8 +218,8 @@ def _box(p, sz=16):
     bd = OxmlElement('w:pBdr')
     for s in ['top','bottom','left','right']:
         e = OxmlElement(f'w:{s}')
-        e.set(qn('w:val'),'single'); e.set(qn('w:sz'),str(sz))
-        e.set(qn('w:space'),'6'); e.set(qn('w:color'),'000000')
+        e.set(QN_VAL,'single'); e.set(QN_SZ,str(sz))
+        e.set(QN_SPACE,'6'); e.set(QN_COLOR,'000000')
         bd.append(e)
     ppr.append(bd)
 
@@ -85,8 +235,8 @@ def _hr(p, sz=6, color='999999'):
     ppr = p._element.get_or_add_pPr()
     bd = OxmlElement('w:pBdr')
     b = OxmlElement('w:bottom')
-    b.set(qn('w:val'),'single'); b.set(qn('w:sz'),str(sz))
-    b.set(qn('w:space'),'1'); b.set(qn('w:color'),color)
+    b.set(QN_VAL,'single'); b.set(QN_SZ,str(sz))
+    b.set(QN_SPACE,'1'); b.set(QN_COLOR,color)
     bd.append(b)
     ppr.append(bd)
 
@@ -94,13 +244,13 @@ def _page_border(sec):
     """Add page border to a section (like the PDF reference)."""
     sp = sec._sectPr
     pgBorders = OxmlElement('w:pgBorders')
-    pgBorders.set(qn('w:offsetFrom'), 'page')
+    pgBorders.set(QN_OFFSETFROM, 'page')
     for side in ['top', 'bottom', 'left', 'right']:
         el = OxmlElement(f'w:{side}')
-        el.set(qn('w:val'), 'single')
-        el.set(qn('w:sz'), '12')
-        el.set(qn('w:space'), '24')
-        el.set(qn('w:color'), '000000')
+        el.set(QN_VAL, 'single')
+        el.set(QN_SZ, '12')
+        el.set(QN_SPACE, '24')
+        el.set(QN_COLOR, '000000')
         pgBorders.append(el)
     sp.append(pgBorders)
 
@@ -138,19 +288,19 @@ def build_title_page(doc):
     # Students / Supervisor table (borderless, RTL)
     tbl = doc.add_table(rows=1, cols=2)
     tbl.alignment = WD_TABLE_ALIGNMENT.CENTER
-    tp_ = tbl._element.find(qn('w:tblPr'))
+    tp_ = tbl._element.find(QN_TBLPR)
     if tp_ is None:
         tp_ = OxmlElement('w:tblPr'); tbl._element.insert(0, tp_)
     # no borders
     tb = OxmlElement('w:tblBorders')
     for s in ['top','bottom','left','right','insideH','insideV']:
         e = OxmlElement(f'w:{s}')
-        e.set(qn('w:val'),'none'); e.set(qn('w:sz'),'0')
-        e.set(qn('w:space'),'0'); e.set(qn('w:color'),'auto')
+        e.set(QN_VAL,'none'); e.set(QN_SZ,'0')
+        e.set(QN_SPACE,'0'); e.set(QN_COLOR,'auto')
         tb.append(e)
     tp_.append(tb)
-    tw = OxmlElement('w:tblW'); tw.set(qn('w:w'),'5000'); tw.set(qn('w:type'),'pct')
-    for o in tp_.findall(qn('w:tblW')): tp_.remove(o)
+    tw = OxmlElement('w:tblW'); tw.set(QN_W,'5000'); tw.set(QN_TYPE,'pct')
+    for o in tp_.findall(QN_TBLW): tp_.remove(o)
     tp_.append(tw)
     tp_.append(OxmlElement('w:bidiVisual'))
 
@@ -269,64 +419,107 @@ def build_dedication(doc):
 
 # ─── body merge ─────────────────────────────────────────────
 
-def copy_body(body_doc, final_doc):
-    """Copy body from styled doc starting from المقدمة العامة."""
-    # Find start
-    body_paras = body_doc.paragraphs
-    start_idx = None
-    for i, p in enumerate(body_paras):
-        if p.style.name == 'Heading 1' and 'المقدمة' in (p.text or ''):
-            start_idx = i; break
-    if start_idx is None: start_idx = 25
+IMAGE_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+HLINK_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
+
+CT_NS = '{http://schemas.openxmlformats.org/package/2006/content-types}'
+
+def load_body(docx_file):
+    """Read only what copy_body() needs from a DOCX, without building a Document.
+
+    Returns the parsed w:body and {rId: (reltype, value)} for the internal
+    image relationships (value = (partname, content type, image bytes)) and
+    the external hyperlinks (value = URL).
+    """
+    with zipfile.ZipFile(docx_file) as z:
+        body = parse_xml(z.read('word/document.xml')).find(QN_BODY)
+        # Content types: per-part overrides, else the default for the extension
+        overrides, defaults = {}, {}
+        for ct in etree.fromstring(z.read('[Content_Types].xml')):
+            if ct.tag == CT_NS + 'Override':
+                overrides[ct.get('PartName').lower()] = ct.get('ContentType')
+            elif ct.tag == CT_NS + 'Default':
+                defaults[ct.get('Extension').lower()] = ct.get('ContentType')
+        rels = {}
+        for rel in etree.fromstring(z.read('word/_rels/document.xml.rels')):
+            reltype, target = rel.get('Type'), rel.get('Target')
+            external = rel.get('TargetMode') == 'External'
+            if reltype == IMAGE_REL and not external:
+                # Targets are relative to word/ unless absolute
+                name = target[1:] if target.startswith('/') else posixpath.normpath('word/' + target)
+                partname = '/' + name
+                content_type = overrides.get(partname.lower()) or \
+                    defaults.get(posixpath.splitext(name)[1][1:].lower())
+                rels[rel.get('Id')] = (reltype, (partname, content_type, z.read(name)))
+            elif reltype == HLINK_REL and external:
+                rels[rel.get('Id')] = (reltype, target)
+    return body, rels
+
+def add_image_part(final_doc, partname, content_type, blob):
+    """Relate image bytes to the final document part; returns the new rId.
+
+    get_or_add_image() only knows the raster formats python-docx can parse;
+    anything else (SVG, EMF, WMF...) is added as a plain part under a free
+    /word/media/ name, with the content type it had in the source package.
+    """
+    try:
+        return final_doc.part.get_or_add_image(io.BytesIO(blob))[0]
+    except UnrecognizedImageError:
+        package = final_doc.part.package
+        ext = posixpath.splitext(partname)[1]
+        part = Part(package.next_partname('/word/media/image%d' + ext),
+                    content_type, blob, package)
+        return final_doc.part.relate_to(part, IMAGE_REL)
+
+def copy_body(bb, body_rels, final_doc):
+    """Move body `bb` (from load_body) starting from المقدمة العامة.
+
+    The body elements are moved, not copied: `bb` is left without them.
+    """
+    # Find start: one pass over the body XML for the المقدمة Heading 1,
+    # remembering paragraph 25 as the fallback start on the way
+    start_idx = el_start = fallback = None
+    pc = 0
+    for idx, ch in enumerate(bb):
+        if ch.tag != QN_P: continue
+        if P_STYLE(ch) == 'Heading1' and 'المقدمة' in ''.join((e.text or '') for e in ch.iter(QN_T)):
+            start_idx = pc; el_start = idx; break
+        if pc == 25: fallback = idx
+        pc += 1
+    if start_idx is None: start_idx = 25; el_start = fallback
     print(f"  Body starts at paragraph {start_idx}")
-
-    # Find element index
-    bb = body_doc.element.body
-    kids = list(bb)
-    pc = 0; el_start = None
-    for idx, ch in enumerate(kids):
-        t = ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag
-        if t == 'p':
-            if pc == start_idx: el_start = idx; break
-            pc += 1
     if el_start is None:
         print("  ERROR: cannot find start element"); return False
+    kids = list(bb)
 
     # Map image relationships
-    IMAGE_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
-    HLINK_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink'
     rid_map = {}
-    for rel in body_doc.part.rels.values():
-        try:
-            if rel.reltype == IMAGE_REL and not rel.is_external:
-                rid_map[rel.rId] = final_doc.part.relate_to(rel.target_part, rel.reltype)
-            elif rel.reltype == HLINK_REL and rel.is_external:
-                rid_map[rel.rId] = final_doc.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
-        except: pass
+    for rid, (reltype, value) in body_rels.items():
+        if reltype == IMAGE_REL:
+            rid_map[rid] = add_image_part(final_doc, *value)
+        else:
+            rid_map[rid] = final_doc.part.relate_to(value, reltype, is_external=True)
 
-    r_ns = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
     fb = final_doc.element.body
     # Find last sectPr
     last_sect = None
-    for ch in reversed(list(fb)):
-        if (ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag) == 'sectPr':
+    for ch in reversed(fb):
+        if ch.tag == QN_SECTPR:
             last_sect = ch; break
 
-    cnt = 0
-    for idx in range(el_start, len(kids)):
-        ch = kids[idx]
-        t = ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag
-        if t == 'sectPr': continue
-        ne = copy.deepcopy(ch)
-        for ae in ne.iter():
-            for an in [f'{{{r_ns}}}embed', f'{{{r_ns}}}link', f'{{{r_ns}}}id']:
+    # Remap relationship ids with one XPath sweep over the source body; the
+    # blocks before el_start and its sectPr are dropped with it afterwards
+    if rid_map:
+        for ae in RID_XPATH(bb):
+            for an in QN_REL_ATTRS:
                 old = ae.get(an)
                 if old and old in rid_map: ae.set(an, rid_map[old])
-        if last_sect is not None:
-            fb.insert(list(fb).index(last_sect), ne)
-        else:
-            fb.append(ne)
-        cnt += 1
+    # Moved into final_doc by the insert below
+    new_children = [ch for ch in kids[el_start:] if ch.tag != QN_SECTPR]
+    # Insert everything before the final sectPr with one slice assignment
+    at = fb.index(last_sect) if last_sect is not None else len(fb)
+    fb[at:at] = new_children
+    cnt = len(new_children)
     print(f"  Copied {cnt} elements")
     return True
 
@@ -336,65 +529,60 @@ def copy_body(body_doc, final_doc):
 def setup_sections(doc):
     """Insert section break before المقدمة, page numbers start at 1 from body."""
     fb = doc.element.body
+    children = list(fb)  # one snapshot serves every lookup below
 
     # Find المقدمة by XML
-    intro = None
-    for ch in fb:
-        t = ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag
-        if t != 'p': continue
-        pPr = ch.find(qn('w:pPr'))
-        if pPr is not None:
-            ps = pPr.find(qn('w:pStyle'))
-            if ps is not None and ps.get(qn('w:val')) == 'Heading1':
-                txt = ''.join((e.text or '') for e in ch.iter(qn('w:t')))
-                if 'المقدمة' in txt:
-                    intro = ch; break
-
-    if intro is None:
+    intro_idx = None
+    for idx, ch in enumerate(children):
+        if ch.tag != QN_P: continue
+        if P_STYLE(ch) == 'Heading1':
+            txt = ''.join((e.text or '') for e in ch.iter(QN_T))
+            if 'المقدمة' in txt:
+                intro_idx = idx; break
+
+    if intro_idx is None:
         print("  Warning: Could not find المقدمة"); return
 
-    idx = list(fb).index(intro)
     # Find prev paragraph
     prev = None
-    for i in range(idx-1, -1, -1):
-        ch = list(fb)[i]
-        if (ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag) == 'p':
+    for ch in reversed(children[:intro_idx]):
+        if ch.tag == QN_P:
             prev = ch; break
 
     if prev:
-        pPr = prev.find(qn('w:pPr'))
+        pPr = prev.find(QN_PPR)
         if pPr is None:
             pPr = OxmlElement('w:pPr'); prev.insert(0, pPr)
         sp = OxmlElement('w:sectPr')
-        st = OxmlElement('w:type'); st.set(qn('w:val'), 'nextPage'); sp.append(st)
+        st = OxmlElement('w:type'); st.set(QN_VAL, 'nextPage'); sp.append(st)
         ps = OxmlElement('w:pgSz')
-        ps.set(qn('w:w'), str(int(21*567))); ps.set(qn('w:h'), str(int(29.7*567)))
+        ps.set(QN_W, str(int(21*567))); ps.set(QN_H, str(int(29.7*567)))
         sp.append(ps)
         pm = OxmlElement('w:pgMar')
-        pm.set(qn('w:top'), str(int(2.5*567))); pm.set(qn('w:bottom'), str(int(2.5*567)))
-        pm.set(qn('w:left'), str(int(2*567))); pm.set(qn('w:right'), str(int(3*567)))
-        pm.set(qn('w:header'), '720'); pm.set(qn('w:footer'), '720')
+        pm.set(QN_TOP, str(int(2.5*567))); pm.set(QN_BOTTOM, str(int(2.5*567)))
+        pm.set(QN_LEFT, str(int(2*567))); pm.set(QN_RIGHT, str(int(3*567)))
+        pm.set(QN_HEADER, '720'); pm.set(QN_FOOTER, '720')
         sp.append(pm)
         sp.append(OxmlElement('w:bidi'))
         pPr.append(sp)
 
     # Last sectPr = body section
-    sects = fb.findall(qn('w:sectPr'))
+    sects = [ch for ch in children if ch.tag == QN_SECTPR]
     if sects:
         ls = sects[-1]
-        for o in ls.findall(qn('w:pgSz')): ls.remove(o)
+        for o in ls.findall(QN_PGSZ): ls.remove(o)
         ps = OxmlElement('w:pgSz')
-        ps.set(qn('w:w'), str(int(21*567))); ps.set(qn('w:h'), str(int(29.7*567)))
+        ps.set(QN_W, str(int(21*567))); ps.set(QN_H, str(int(29.7*567)))
         ls.append(ps)
-        for o in ls.findall(qn('w:pgMar')): ls.remove(o)
+        for o in ls.findall(QN_PGMAR): ls.remove(o)
         pm = OxmlElement('w:pgMar')
-        pm.set(qn('w:top'), str(int(2.5*567))); pm.set(qn('w:bottom'), str(int(2.5*567)))
-        pm.set(qn('w:left'), str(int(2*567))); pm.set(qn('w:right'), str(int(3*567)))
-        pm.set(qn('w:header'), '720'); pm.set(qn('w:footer'), '720')
+        pm.set(QN_TOP, str(int(2.5*567))); pm.set(QN_BOTTOM, str(int(2.5*567)))
+        pm.set(QN_LEFT, str(int(2*567))); pm.set(QN_RIGHT, str(int(3*567)))
+        pm.set(QN_HEADER, '720'); pm.set(QN_FOOTER, '720')
         ls.append(pm)
-        for o in ls.findall(qn('w:pgNumType')): ls.remove(o)
-        pgn = OxmlElement('w:pgNumType'); pgn.set(qn('w:start'), '1'); ls.append(pgn)
-        for o in ls.findall(qn('w:bidi')): ls.remove(o)
+        for o in ls.findall(QN_PGNUMTYPE): ls.remove(o)
+        pgn = OxmlElement('w:pgNumType'); pgn.set(QN_START, '1'); ls.append(pgn)
+        for o in ls.findall(QN_BIDI): ls.remove(o)
         ls.append(OxmlElement('w:bidi'))
 
     # Footer with page number on body section
@@ -404,13 +592,13 @@ def setup_sections(doc):
     fp = ftr.paragraphs[0] if ftr.paragraphs else ftr.add_paragraph()
     fp.alignment = WD_ALIGN_PARAGRAPH.CENTER; _bidi(fp)
     r = fp.add_run()
-    fb_ = OxmlElement('w:fldChar'); fb_.set(qn('w:fldCharType'), 'begin')
+    fb_ = OxmlElement('w:fldChar'); fb_.set(QN_FLDCHARTYPE, 'begin')
     r._element.append(fb_)
     r2 = fp.add_run()
-    ins = OxmlElement('w:instrText'); ins.set(qn('xml:space'), 'preserve')
+    ins = OxmlElement('w:instrText'); ins.set(QN_XML_SPACE, 'preserve')
     ins.text = ' PAGE '; r2._element.append(ins)
     r3 = fp.add_run()
-    fe = OxmlElement('w:fldChar'); fe.set(qn('w:fldCharType'), 'end')
+    fe = OxmlElement('w:fldChar'); fe.set(QN_FLDCHARTYPE, 'end')
     r3._element.append(fe)
     for rr in [r, r2, r3]: rr.font.size = Pt(11); rr.font.name = LF
 
@@ -426,6 +614,38 @@ def setup_sections(doc):
 
 # ─── main ───────────────────────────────────────────────────
 
+def _write_part(self, pack_uri, blob):
+    """_ZipPkgWriter.write(), storing already-compressed figures as they are."""
+    zipf = getattr(self, '_zipf', None)
+    if not isinstance(zipf, zipfile.ZipFile):
+        return _STOCK_WRITE(self, pack_uri, blob)
+    name = pack_uri.membername
+    stored = name.startswith('word/media/') and name.lower().endswith(STORED_EXTS)
+    zipf.writestr(name, blob, compress_type=zipfile.ZIP_STORED if stored else None)
+
+def _save(doc, path):
+    """doc.save() to a path or file, skipping deflate for images and using
+    fast_zlib if available."""
+    std_zlib = zipfile.zlib
+    if _STOCK_WRITE is not None:
+        _ZipPkgWriter.write = _write_part
+    if fast_zlib is not None:
+        # zipfile looks up compressobj, DEFLATED and Z_DEFAULT_COMPRESSION on
+        # this module, so each backend gets a level it accepts. Swapped only for
+        # the save itself; nothing else in this process writes a zip meanwhile
+        zipfile.zlib = fast_zlib
+    try:
+        doc.save(path)
+    finally:
+        if _STOCK_WRITE is not None:
+            _ZipPkgWriter.write = _STOCK_WRITE
+        zipfile.zlib = std_zlib
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
 def main():
     print("=" * 60)
     print("  Building final DOCX (clean, from scratch)")
@@ -437,13 +657,14 @@ def main():
     n = doc.styles['Normal']
     n.font.name = AF; n.font.size = Pt(14)
     rpr = n.element.get_or_add_rPr()
-    rf = OxmlElement('w:rFonts')
-    rf.set(qn('w:cs'), AF); rf.set(qn('w:ascii'), LF); rf.set(qn('w:hAnsi'), LF)
-    for o in rpr.findall(qn('w:rFonts')): rpr.remove(o)
-    rpr.insert(0, rf)
+    rf = rpr.find(QN_RFONTS)  # just created by font.name above
+    if rf is None:
+        rf = OxmlElement('w:rFonts'); rpr.insert(0, rf)
+    else:
+        rf.attrib.clear()
+    rf.set(QN_CS, AF); rf.set(QN_ASCII, LF); rf.set(QN_HANSI, LF)
     pp = n.element.get_or_add_pPr()
-    for o in pp.findall(qn('w:bidi')): pp.remove(o)
-    pp.append(OxmlElement('w:bidi'))
+    if pp.find(QN_BIDI) is None: pp.append(OxmlElement('w:bidi'))
 
     # Page setup
     sec = doc.sections[0]
@@ -452,8 +673,10 @@ def main():
     sec.page_height = Cm(29.7); sec.page_width = Cm(21)
 
     # Remove default empty para
-    if doc.paragraphs:
-        doc.paragraphs[0]._element.getparent().remove(doc.paragraphs[0]._element)
+    fb = doc.element.body
+    first_p = fb.find(QN_P)
+    if first_p is not None:
+        fb.remove(first_p)
 
     print("\n[1/5] Building title page...")
     build_title_page(doc)
@@ -465,32 +688,40 @@ def main():
     build_dedication(doc)
 
     print("[4/5] Copying body content...")
-    body_doc = Document(BODY_DOCX)
-    copy_body(body_doc, doc)
+    body, body_rels = load_body(io.BytesIO(_read_bytes(BODY_DOCX)))
+    copy_body(body, body_rels, doc)
 
     print("[5/5] Setting up page numbering...")
     setup_sections(doc)
 
-    doc.save(OUTPUT)
-    kb = os.path.getsize(OUTPUT) / 1024
+    # Build the whole zip in memory, then hand it to the OS in one write
+    buf = io.BytesIO()
+    _save(doc, buf)
+    data = buf.getbuffer()
+    with open(OUTPUT, 'wb') as f:
+        f.write(data)
+    kb = data.nbytes / 1024
 
     # Stats via XML to avoid relationship issues
-    h1 = 0
-    for ch in doc.element.body:
-        t = ch.tag.split('}')[-1] if '}' in ch.tag else ch.tag
-        if t == 'p':
-            pPr = ch.find(qn('w:pPr'))
-            if pPr is not None:
-                ps = pPr.find(qn('w:pStyle'))
-                if ps is not None and ps.get(qn('w:val')) == 'Heading1': h1 += 1
+    h1 = n_paras = n_tables = 0
+    for ch in fb:
+        if ch.tag == QN_P:
+            n_paras += 1
+            if P_STYLE(ch) == 'Heading1': h1 += 1
+        elif ch.tag == QN_TBL:
+            n_tables += 1
 
     print(f"\n{'='*60}")
     print(f"  SUCCESS! → {OUTPUT}")
-    print(f"  Size: {kb:.0f} KB | Paragraphs: {len(doc.paragraphs)}")
-    print(f"  Tables: {len(doc.tables)} | Sections: {len(doc.sections)} | H1: {h1}")
+    print(f"  Size: {kb:.0f} KB | Paragraphs: {n_paras}")
+    print(f"  Tables: {n_tables} | Sections: {len(doc.sections)} | H1: {h1}")
     print(f"{'='*60}")
 
-    shutil.copy2(OUTPUT, os.path.join(BASE, 'main_word.docx'))
+    # Written from the buffer still in memory rather than re-read from OUTPUT.
+    # Not a hard link: postprocess_docx.py rewrites main_word.docx in place,
+    # which would then rewrite main_word_final.docx as well.
+    with open(os.path.join(BASE, 'main_word.docx'), 'wb') as f:
+        f.write(data)
     print("  Also copied to main_word.docx")
 
 
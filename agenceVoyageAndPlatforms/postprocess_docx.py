@@ -1,85 +1,113 @@
 """Post-process the DOCX to ensure Arabic font and RTL are applied everywhere."""
+import functools
+import re
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
 from docx.shared import Pt
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+# Arabic + Arabic Supplement blocks; search() stops at the first hit
+ARABIC_RE = re.compile('[\u0600-\u06FF\u0750-\u077F]')
+
 doc = Document('main_word.docx')
 
-def set_paragraph_rtl_and_font(paragraph, font_name='Traditional Arabic', font_size_pt=14):
-    """Ensure a paragraph has RTL direction and Arabic font."""
+QN_BIDI = qn('w:bidi')
+QN_RFONTS = qn('w:rFonts')
+QN_CS = qn('w:cs')
+QN_ASCII = qn('w:ascii')
+QN_HANSI = qn('w:hAnsi')
+QN_RTL = qn('w:rtl')
+QN_SZCS = qn('w:szCs')
+QN_VAL = qn('w:val')
+
+
+@functools.lru_cache(maxsize=None)
+def rfonts_attrs(font_name, has_arabic):
+    """rFonts attributes for a run; only a couple of combinations per document."""
+    # If the text is primarily Latin/English, use Times New Roman
+    latin = font_name if has_arabic else 'Times New Roman'
+    return {QN_CS: font_name, QN_ASCII: latin, QN_HANSI: latin}
+
+
+def set_paragraph_rtl_and_font(p, font_name='Traditional Arabic', font_size_pt=14):
+    """Ensure a w:p element has RTL direction and Arabic font."""
     # Set paragraph-level bidi
-    ppr = paragraph._element.get_or_add_pPr()
-    bidi = ppr.find(qn('w:bidi'))
+    ppr = p.get_or_add_pPr()
+    bidi = ppr.find(QN_BIDI)
     if bidi is None:
         bidi = OxmlElement('w:bidi')
         ppr.append(bidi)
 
+    sz_val = str(font_size_pt * 2)
+
     # Set each run's font
-    for run in paragraph.runs:
-        rpr = run._element.get_or_add_rPr()
-        
-        # Set complex script font
-        existing_fonts = rpr.find(qn('w:rFonts'))
+    for r in p.r_lst:
+        rpr = r.get_or_add_rPr()
+        has_arabic = ARABIC_RE.search(r.text) is not None
+
+        # Set complex script font (and the Latin ones)
+        existing_fonts = rpr.find(QN_RFONTS)
         if existing_fonts is None:
             existing_fonts = OxmlElement('w:rFonts')
             rpr.append(existing_fonts)
-        existing_fonts.set(qn('w:cs'), font_name)
-        
-        # If the text is primarily Latin/English, use Times New Roman
-        text = run.text or ''
-        has_arabic = any('\u0600' <= c <= '\u06FF' or '\u0750' <= c <= '\u077F' for c in text)
-        if has_arabic:
-            existing_fonts.set(qn('w:ascii'), font_name)
-            existing_fonts.set(qn('w:hAnsi'), font_name)
-        else:
-            existing_fonts.set(qn('w:ascii'), 'Times New Roman')
-            existing_fonts.set(qn('w:hAnsi'), 'Times New Roman')
-        
+        existing_fonts.attrib.update(rfonts_attrs(font_name, has_arabic))
+
         # Set RTL for runs with Arabic text
         if has_arabic:
-            rtl = rpr.find(qn('w:rtl'))
+            rtl = rpr.find(QN_RTL)
             if rtl is None:
                 rtl = OxmlElement('w:rtl')
                 rpr.append(rtl)
 
         # Set cs font size
-        sz_cs = rpr.find(qn('w:szCs'))
+        sz_cs = rpr.find(QN_SZCS)
         if sz_cs is None:
             sz_cs = OxmlElement('w:szCs')
             rpr.append(sz_cs)
-        sz_cs.set(qn('w:val'), str(font_size_pt * 2))
+        sz_cs.set(QN_VAL, sz_val)
+
+def heading_size(style_name):
+    """cs font size (pt) for paragraphs of the named style."""
+    if 'Heading 1' in style_name:
+        return 22
+    elif 'Heading 2' in style_name:
+        return 18
+    elif 'Heading 3' in style_name:
+        return 16
+    # Heading 4 and body text
+    return 14
+
+# Size per paragraph styleId, resolved once; unknown or missing ids fall back
+# to the default paragraph style, as python-docx's paragraph.style does
+size_by_style = {s.style_id: heading_size(s.name or '')
+                 for s in doc.styles if s.type == WD_STYLE_TYPE.PARAGRAPH}
+default_style = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+default_size = heading_size(default_style.name if default_style is not None else '')
+
+# Work on the body XML directly, without python-docx Paragraph/Table/Run wrappers
+body = doc.element.body
+paragraphs = body.xpath('./w:p')
+tables = body.xpath('./w:tbl')
 
 # Process all paragraphs
-for para in doc.paragraphs:
-    style = para.style.name
-    if 'Heading 1' in style:
-        set_paragraph_rtl_and_font(para, font_size_pt=22)
-    elif 'Heading 2' in style:
-        set_paragraph_rtl_and_font(para, font_size_pt=18)
-    elif 'Heading 3' in style:
-        set_paragraph_rtl_and_font(para, font_size_pt=16)
-    elif 'Heading 4' in style:
-        set_paragraph_rtl_and_font(para, font_size_pt=14)
-    else:
-        set_paragraph_rtl_and_font(para, font_size_pt=14)
-
-# Process table cells
-for table in doc.tables:
-    for row in table.rows:
-        for cell in row.cells:
-            for para in cell.paragraphs:
-                set_paragraph_rtl_and_font(para, font_size_pt=12)
+for p in paragraphs:
+    size = size_by_style.get(p.style, default_size)
+    set_paragraph_rtl_and_font(p, font_size_pt=size)
+
+# Process table cells (the continuation cells of a vertical merge hold no content)
+for tbl in tables:
+    for p in tbl.xpath("./w:tr/w:tc[not(w:tcPr/w:vMerge) or w:tcPr/w:vMerge/@w:val='restart']/w:p"):
+        set_paragraph_rtl_and_font(p, font_size_pt=12)
 
 # Set document-level RTL in section properties
-for section in doc.sections:
-    sectPr = section._sectPr
-    bidi = sectPr.find(qn('w:bidi'))
+for sectPr in body.xpath('./w:p/w:pPr/w:sectPr | ./w:sectPr'):
+    bidi = sectPr.find(QN_BIDI)
     if bidi is None:
         bidi = OxmlElement('w:bidi')
         sectPr.append(bidi)
 
 doc.save('main_word.docx')
 print("Post-processing complete! Arabic fonts and RTL applied to all content.")
-print(f"Paragraphs: {len(doc.paragraphs)}")
-print(f"Tables: {len(doc.tables)}")
+print(f"Paragraphs: {len(paragraphs)}")
+print(f"Tables: {len(tables)}")
@@ -0,0 +1,35 @@
+"""Run the DOCX checks as one suite, parsing each document only once.
+
+    python run_checks.py                  # all checks
+    python run_checks.py docx styles      # a selection
+"""
+
+import argparse
+from docx_fast import load_body
+from audit_align import run_audit
+from check_docx import run_check_docx
+from check_structure import run_check_structure
+from check_styles import run_check_styles
+
+DOCX = 'main_word.docx'
+
+# audit works on the styled output and streams it itself; the others share
+# one materialized body of main_word.docx (load_body is cached per path)
+CHECKS = {
+    'audit': lambda: run_audit(),
+    'docx': lambda: run_check_docx(load_body(DOCX)),
+    'structure': lambda: run_check_structure(load_body(DOCX)),
+    'styles': lambda: run_check_styles(load_body(DOCX)),
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the DOCX checks.')
+    parser.add_argument('checks', nargs='*', metavar='check',
+                        help=f"any of: {', '.join(CHECKS)} (default: all)")
+    names = parser.parse_args().checks or list(CHECKS)
+    unknown = [n for n in names if n not in CHECKS]
+    if unknown:
+        parser.error(f"unknown check: {', '.join(unknown)}")
+    for name in names:
+        print(f"\n{'=' * 20} {name} {'=' * 20}")
+        CHECKS[name]()
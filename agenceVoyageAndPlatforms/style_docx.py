@@ -17,14 +17,20 @@ LaTeX styling:
 """
 
 import os
+import re
 import copy
+import functools
 from docx import Document
-from docx.shared import Pt, Cm, Inches, RGBColor, Emu
+from docx.shared import Pt, Cm, Inches, RGBColor, Emu, Twips
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
 from docx.enum.table import WD_TABLE_ALIGNMENT, WD_ALIGN_VERTICAL
 from docx.enum.section import WD_ORIENT
-from docx.oxml.ns import qn, nsdecls
+from docx.oxml.ns import qn, nsdecls, nsmap
 from docx.oxml import OxmlElement, parse_xml
+from docx.text.parfmt import ParagraphFormat
+from lxml import etree
+from lxml.etree import SubElement
+from docx_fast import paragraph_styles, paragraph_text
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 INPUT = os.path.join(BASE, 'main_word.docx')
@@ -33,81 +39,234 @@ OUTPUT = os.path.join(BASE, 'main_word_styled.docx')
 ARABIC_FONT = 'Traditional Arabic'
 LATIN_FONT = 'Times New Roman'
 
+ARABIC_RE = re.compile('[\u0600-\u06FF\u0750-\u077F]')
+
+# Clark names, resolved once here instead of by qn() at every call site
+QN_RPR = qn('w:rPr')
+QN_RFONTS = qn('w:rFonts')
+QN_ASCII = qn('w:ascii')
+QN_HANSI = qn('w:hAnsi')
+QN_CS = qn('w:cs')
+QN_SZCS = qn('w:szCs')
+QN_BCS = qn('w:bCs')
+QN_RTL = qn('w:rtl')
+
+QN_BIDI = qn('w:bidi')
+QN_SPACING = qn('w:spacing')
+QN_BEFORE = qn('w:before')
+QN_AFTER = qn('w:after')
+QN_LINE = qn('w:line')
+QN_LINERULE = qn('w:lineRule')
+QN_KEEPNEXT = qn('w:keepNext')
+
+QN_VAL = qn('w:val')
+
+PARAS_XPATH = etree.XPath('./w:p', namespaces={'w': nsmap['w']})
+RUNS_XPATH = etree.XPath('./w:r', namespaces={'w': nsmap['w']})
+RUN_T_XPATH = etree.XPath('w:t/text()', namespaces={'w': nsmap['w']})
+P_STYLE = etree.XPath('string(w:pPr/w:pStyle/@w:val)', namespaces={'w': nsmap['w']})
+QN_FILL = qn('w:fill')
+QN_SHD = qn('w:shd')
+QN_VALIGN = qn('w:vAlign')
+
 # ──────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────
 
 def has_arabic(text):
-    return any('\u0600' <= c <= '\u06FF' or '\u0750' <= c <= '\u077F' for c in (text or ''))
-
-
-def set_run_font(run, font_name_ar=ARABIC_FONT, font_name_lat=LATIN_FONT, size_pt=14, bold=None, color=None):
-    """Set font properties on a run."""
-    rpr = run._element.get_or_add_rPr()
+    return text is not None and ARABIC_RE.search(text) is not None
+
+
+# A run's whole rPr in the order python-docx's own setters would leave it
+RPR_TMPL = ('<w:rPr %s><w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{cs}"/>{b}{color}'
+            '<w:sz w:val="{sz}"/><w:szCs w:val="{sz}"/>{b_cs}{rtl}</w:rPr>' % nsdecls('w'))
+
+
+@functools.lru_cache(maxsize=64)
+def build_rpr(font_name_ar, font_name_lat, size_pt, bold, color, arabic):
+    """Template w:rPr for a run that has none; callers attach a deepcopy of it.
+
+    Only a handful of (size, bold, color, script) combinations occur in the
+    whole document, so each is parsed once.
+    """
+    return parse_xml(RPR_TMPL.format(
+        font=font_name_ar if arabic else font_name_lat,
+        cs=font_name_ar,
+        b='' if bold is None else '<w:b/>' if bold else '<w:b w:val="0"/>',
+        color='' if color is None else f'<w:color w:val="{color}"/>',
+        sz=int(size_pt * 2),
+        b_cs='<w:bCs/>' if bold else '',
+        rtl='<w:rtl/>' if arabic else '',
+    ))
+
+
+# Style-level rPr / pPr children, spliced in by replace_props()
+STYLE_RPR_TMPL = ('<w:rPr %s><w:rFonts w:cs="%s" w:ascii="%s" w:hAnsi="%s"/>'
+                  '<w:szCs w:val="{sz}"/>{tail}</w:rPr>' % (nsdecls('w'), ARABIC_FONT, LATIN_FONT, LATIN_FONT))
+STYLE_PPR_TMPL = '<w:pPr %s><w:bidi/><w:jc w:val="{align}"/>{spacing}</w:pPr>' % nsdecls('w')
+
+
+# w:sz / w:szCs values (half-points) of the run sizes used below
+HALF_POINTS = {pt: str(pt * 2) for pt in (11, 14, 15, 16, 18, 24, 26)}
+
+# Run colors of the chapter / section headings and the front-matter titles
+COLOR_H1 = RGBColor(0x1F, 0x38, 0x64)
+COLOR_H2 = RGBColor(0x2E, 0x40, 0x57)
+COLOR_H3 = RGBColor(0x37, 0x41, 0x51)
+COLOR_H4 = RGBColor(0x4B, 0x55, 0x63)
+COLOR_FRONT_TITLE = COLOR_H1
+
+# Leading text that marks a Normal body paragraph as a list item
+LIST_MARKERS = ('--', '►', '•')
+
+# Heading styles configuration
+# NOTE: With w:bidi set, Word swaps left/right semantics.
+# So 'left' in XML = visually RIGHT for RTL paragraphs.
+HEADING_STYLES = {
+    'Heading 1': {'size': 24, 'color': '1F3864', 'space_before': 0, 'space_after': 480, 'align': 'center', 'page_break': True},
+    'Heading 2': {'size': 18, 'color': '2E4057', 'space_before': 360, 'space_after': 200, 'align': 'left', 'page_break': False},
+    'Heading 3': {'size': 16, 'color': '374151', 'space_before': 240, 'space_after': 120, 'align': 'left', 'page_break': False},
+    'Heading 4': {'size': 14, 'color': '4B5563', 'space_before': 200, 'space_after': 100, 'align': 'left', 'page_break': False},
+}
+HEADING_RPR_TAIL = '<w:rtl/><w:bCs/>'
+HEADING_SPACING_TMPL = ('<w:spacing w:before="{space_before}" w:after="{space_after}"'
+                        ' w:line="360" w:lineRule="auto"/>')
+
+
+def replace_props(props, xml, front=0):
+    """Swap the children of `props` that share a tag with the parsed `xml` for its children.
+
+    The first `front` new children go to the start of `props`, the rest to its end.
+    """
+    new = list(parse_xml(xml))
+    tags = {el.tag for el in new}
+    for old in [c for c in props if c.tag in tags]:
+        props.remove(old)
+    for el in reversed(new[:front]):
+        props.insert(0, el)
+    props.extend(new[front:])
+
+
+def configure_heading_style(style, cfg):
+    """Apply a HEADING_STYLES entry to a w:style element.
+
+    Children the table does not mention (outlineLvl, keepLines, italics...)
+    are left where they are.
+    """
+    # rPr: size, bold and color at their schema positions; then rFonts first
+    # and szCs, rtl, bCs last
+    rpr = style.get_or_add_rPr()
+    rpr.get_or_add_sz().set(QN_VAL, str(cfg['size'] * 2))
+    rpr.get_or_add_b().attrib.pop(QN_VAL, None)
+    if cfg['color']:
+        rpr._remove_color()
+        rpr.get_or_add_color().set(QN_VAL, cfg['color'])
+    replace_props(rpr, STYLE_RPR_TMPL.format(sz=cfg['size'] * 2, tail=HEADING_RPR_TAIL), front=1)
+
+    # pPr: bidi, jc, spacing
+    ppr = style.get_or_add_pPr()
+    replace_props(ppr, STYLE_PPR_TMPL.format(align=cfg['align'],
+                                             spacing=HEADING_SPACING_TMPL.format(**cfg)))
+
+    # Keep with next
+    if ppr.find(QN_KEEPNEXT) is None:
+        SubElement(ppr, QN_KEEPNEXT)
+
+
+def set_run_font(r, font_name_ar=ARABIC_FONT, font_name_lat=LATIN_FONT, size_pt=14, bold=None, color=None):
+    """Set font properties on a w:r element."""
+    # Only w:t content can hold Arabic; CT_R.text would also map tabs/breaks
+    arabic = has_arabic(''.join(RUN_T_XPATH(r)))
+    rpr = r.find(QN_RPR)
+    if rpr is None:
+        r.insert(0, copy.deepcopy(build_rpr(font_name_ar, font_name_lat, size_pt, bold, color, arabic)))
+        return
+
+    # Existing rPr: edit in place so its other properties (italic, rStyle...) survive
 
     # Font names
-    fonts = rpr.find(qn('w:rFonts'))
+    fonts = rpr.find(QN_RFONTS)
     if fonts is None:
         fonts = OxmlElement('w:rFonts')
         rpr.insert(0, fonts)
 
-    text = run.text or ''
-    if has_arabic(text):
-        fonts.set(qn('w:ascii'), font_name_ar)
-        fonts.set(qn('w:hAnsi'), font_name_ar)
+    if arabic:
+        fonts.set(QN_ASCII, font_name_ar)
+        fonts.set(QN_HANSI, font_name_ar)
     else:
-        fonts.set(qn('w:ascii'), font_name_lat)
-        fonts.set(qn('w:hAnsi'), font_name_lat)
-    fonts.set(qn('w:cs'), font_name_ar)
-
-    # Size
-    run.font.size = Pt(size_pt)
-    sz_cs = rpr.find(qn('w:szCs'))
+        fonts.set(QN_ASCII, font_name_lat)
+        fonts.set(QN_HANSI, font_name_lat)
+    fonts.set(QN_CS, font_name_ar)
+
+    # Size (get_or_add_* keep the schema child order, as run.font.* would)
+    half_points = HALF_POINTS.get(size_pt) or str(int(size_pt * 2))
+    rpr.get_or_add_sz().set(QN_VAL, half_points)
+    sz_cs = rpr.find(QN_SZCS)
     if sz_cs is None:
-        sz_cs = OxmlElement('w:szCs')
-        rpr.append(sz_cs)
-    sz_cs.set(qn('w:val'), str(int(size_pt * 2)))
+        sz_cs = SubElement(rpr, QN_SZCS)
+    sz_cs.set(QN_VAL, half_points)
 
     # Bold
     if bold is not None:
-        run.font.bold = bold
-        b_cs = rpr.find(qn('w:bCs'))
+        b = rpr.get_or_add_b()
+        if bold:
+            b.attrib.pop(QN_VAL, None)
+        else:
+            b.set(QN_VAL, '0')
+        b_cs = rpr.find(QN_BCS)
         if bold:
             if b_cs is None:
-                b_cs = OxmlElement('w:bCs')
-                rpr.append(b_cs)
+                SubElement(rpr, QN_BCS)
         else:
             if b_cs is not None:
                 rpr.remove(b_cs)
 
     # Color
     if color is not None:
-        run.font.color.rgb = color
+        rpr._remove_color()
+        rpr.get_or_add_color().set(QN_VAL, str(color))
 
     # RTL for Arabic runs
-    if has_arabic(text):
-        rtl = rpr.find(qn('w:rtl'))
-        if rtl is None:
-            rtl = OxmlElement('w:rtl')
-            rpr.append(rtl)
+    if arabic:
+        if rpr.find(QN_RTL) is None:
+            SubElement(rpr, QN_RTL)
+
+
+@functools.lru_cache(maxsize=None)
+def twips(length):
+    """w:spacing twips string for a Length, formatted as python-docx's setters do."""
+    return str(Emu(length).twips)
 
 
-def set_paragraph_format(para, alignment=None, space_before=None, space_after=None,
+@functools.lru_cache(maxsize=None)
+def line_twips(multiple):
+    """w:line value for an 'auto' (multiple-of-single) line spacing like 1.5."""
+    return twips(Emu(multiple * Twips(240)))
+
+
+def set_paragraph_format(p, alignment=None, space_before=None, space_after=None,
                          line_spacing=None, line_rule=None, keep_next=False,
                          page_break_before=False, first_line_indent=None):
-    """Set paragraph-level formatting."""
-    pf = para.paragraph_format
+    """Set paragraph-level formatting on a w:p element."""
+    pf = ParagraphFormat(p)
+    ppr = p.get_or_add_pPr()
 
     if alignment is not None:
         pf.alignment = alignment
 
+    # Spacing attributes written as cached twip strings, bypassing the
+    # ParagraphFormat descriptors' Length conversions
     if space_before is not None:
-        pf.space_before = space_before
+        ppr.get_or_add_spacing().set(QN_BEFORE, twips(space_before))
 
     if space_after is not None:
-        pf.space_after = space_after
+        ppr.get_or_add_spacing().set(QN_AFTER, twips(space_after))
 
-    if line_spacing is not None:
+    if isinstance(line_spacing, float):
+        spacing = ppr.get_or_add_spacing()
+        spacing.set(QN_LINE, line_twips(line_spacing))
+        spacing.set(QN_LINERULE, 'auto')
+    elif line_spacing is not None:
         pf.line_spacing = line_spacing
 
     if line_rule is not None:
@@ -123,88 +282,63 @@ def set_paragraph_format(para, alignment=None, space_before=None, space_after=No
         pf.first_line_indent = first_line_indent
 
     # Always set bidi for RTL
-    ppr = para._element.get_or_add_pPr()
-    bidi = ppr.find(qn('w:bidi'))
-    if bidi is None:
-        bidi = OxmlElement('w:bidi')
-        ppr.append(bidi)
+    if ppr.find(QN_BIDI) is None:
+        SubElement(ppr, QN_BIDI)
+
+
+def set_paragraph_runs_font(p, size_pt=14, bold=None, color=None):
+    """Apply font settings to ALL runs in a w:p element.
 
+    Runs with no content at all (nothing but an rPr) are skipped: there is
+    nothing in them for the font to apply to.
+    """
+    if size_pt is None and bold is None and color is None:
+        return
+    # The w:r children straight from lxml, without wrapping each in a Run
+    for r in RUNS_XPATH(p):
+        if len(r) > (r.find(QN_RPR) is not None):
+            set_run_font(r, size_pt=size_pt, bold=bold, color=color)
 
-def set_paragraph_runs_font(para, size_pt=14, bold=None, color=None):
-    """Apply font settings to ALL runs in a paragraph."""
-    for run in para.runs:
-        set_run_font(run, size_pt=size_pt, bold=bold, color=color)
 
+@functools.lru_cache(maxsize=None)
+def border_xml(tag, sides, sz, color, space):
+    """Parsed <w:pBdr>/<w:tcBorders> with a single line on each of `sides`; deepcopy to attach."""
+    edges = ''.join(f'<w:{side} w:val="single" w:sz="{sz}" w:space="{space}" w:color="{color}"/>'
+                    for side in sides)
+    return parse_xml(f'<w:{tag} {nsdecls("w")}>{edges}</w:{tag}>')
 
-def add_bottom_border(para, sz=4, color='000000'):
+
+def add_bottom_border(p, sz=4, color='000000'):
     """Add a bottom border to a paragraph (like header rule)."""
-    ppr = para._element.get_or_add_pPr()
-    pBdr = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), str(sz))
-    bottom.set(qn('w:space'), '1')
-    bottom.set(qn('w:color'), color)
-    pBdr.append(bottom)
-    ppr.append(pBdr)
-
-
-def add_top_and_bottom_border(para, sz=12, color='000000'):
+    ppr = p.get_or_add_pPr()
+    ppr.append(copy.deepcopy(border_xml('pBdr', ('bottom',), sz, color, 1)))
+
+
+def add_top_and_bottom_border(p, sz=12, color='000000'):
     """Add top and bottom borders (for title box effect)."""
-    ppr = para._element.get_or_add_pPr()
-    pBdr = OxmlElement('w:pBdr')
-    for side in ['top', 'bottom']:
-        el = OxmlElement(f'w:{side}')
-        el.set(qn('w:val'), 'single')
-        el.set(qn('w:sz'), str(sz))
-        el.set(qn('w:space'), '1')
-        el.set(qn('w:color'), color)
-        pBdr.append(el)
-    ppr.append(pBdr)
-
-
-def add_box_border(para, sz=12, color='000000'):
+    ppr = p.get_or_add_pPr()
+    ppr.append(copy.deepcopy(border_xml('pBdr', ('top', 'bottom'), sz, color, 1)))
+
+
+def add_box_border(p, sz=12, color='000000'):
     """Add full box border around a paragraph."""
-    ppr = para._element.get_or_add_pPr()
-    pBdr = OxmlElement('w:pBdr')
-    for side in ['top', 'bottom', 'left', 'right']:
-        el = OxmlElement(f'w:{side}')
-        el.set(qn('w:val'), 'single')
-        el.set(qn('w:sz'), str(sz))
-        el.set(qn('w:space'), '4')
-        el.set(qn('w:color'), color)
-        pBdr.append(el)
-    ppr.append(pBdr)
-
-
-def insert_page_break_before(para):
+    ppr = p.get_or_add_pPr()
+    ppr.append(copy.deepcopy(border_xml('pBdr', ('top', 'bottom', 'left', 'right'), sz, color, 4)))
+
+
+def insert_page_break_before(p):
     """Force page break before this paragraph."""
-    set_paragraph_format(para, page_break_before=True)
-
-
-def set_cell_shading(cell, color='D9E2F3'):
-    """Set background color on a table cell."""
-    tc = cell._element
-    tc_pr = tc.get_or_add_tcPr()
-    shading = OxmlElement('w:shd')
-    shading.set(qn('w:fill'), color)
-    shading.set(qn('w:val'), 'clear')
-    tc_pr.append(shading)
-
-
-def set_cell_borders(cell, sz=4, color='000000'):
-    """Set borders on a single table cell."""
-    tc = cell._element
-    tc_pr = tc.get_or_add_tcPr()
-    tc_borders = OxmlElement('w:tcBorders')
-    for side in ['top', 'bottom', 'left', 'right']:
-        el = OxmlElement(f'w:{side}')
-        el.set(qn('w:val'), 'single')
-        el.set(qn('w:sz'), str(sz))
-        el.set(qn('w:space'), '0')
-        el.set(qn('w:color'), color)
-        tc_borders.append(el)
-    tc_pr.append(tc_borders)
+    set_paragraph_format(p, page_break_before=True)
+
+
+def set_cell_shading(tc_pr, color='D9E2F3'):
+    """Set background color on a table cell, given its w:tcPr."""
+    SubElement(tc_pr, QN_SHD, {QN_FILL: color, QN_VAL: 'clear'})
+
+
+def set_cell_borders(tc_pr, sz=4, color='000000'):
+    """Set borders on a single table cell, given its w:tcPr."""
+    tc_pr.append(copy.deepcopy(border_xml('tcBorders', ('top', 'bottom', 'left', 'right'), sz, color, 0)))
 
 
 def set_table_style(table):
@@ -213,28 +347,34 @@ def set_table_style(table):
 
     # Style all cells
     for i, row in enumerate(table.rows):
+        header = i == 0
         for cell in row.cells:
-            set_cell_borders(cell, sz=4, color='000000')
+            tc_pr = cell._element.get_or_add_tcPr()
+            set_cell_borders(tc_pr, sz=4, color='000000')
 
             # Vertical alignment
-            tc_pr = cell._element.get_or_add_tcPr()
-            v_align = OxmlElement('w:vAlign')
-            v_align.set(qn('w:val'), 'center')
-            tc_pr.append(v_align)
+            SubElement(tc_pr, QN_VALIGN, {QN_VAL: 'center'})
+
+            # Header row: shading, and bold runs below
+            if header:
+                set_cell_shading(tc_pr, 'D9E2F3')
 
-            for para in cell.paragraphs:
-                set_paragraph_format(para,
+            for p in PARAS_XPATH(cell._element):
+                set_paragraph_format(p,
                                      alignment=WD_ALIGN_PARAGRAPH.CENTER,
                                      space_before=Pt(2),
                                      space_after=Pt(2),
                                      line_spacing=1.15)
-                set_paragraph_runs_font(para, size_pt=11, bold=None)
+                set_paragraph_runs_font(p, size_pt=11, bold=None)
+                # Bold in a second pass, so a new w:bCs lands after w:rtl as before
+                if header:
+                    set_paragraph_runs_font(p, size_pt=11, bold=True)
 
-            # Header row: bold + shading
-            if i == 0:
-                set_cell_shading(cell, 'D9E2F3')
-                for para in cell.paragraphs:
-                    set_paragraph_runs_font(para, size_pt=11, bold=True)
+
+# begin / instruction / end runs of a PAGE field, wrapped in a w:p only for parsing
+PAGE_FIELD_XML = ('<w:p %s><w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+                  '<w:r><w:instrText xml:space="preserve"> PAGE </w:instrText></w:r>'
+                  '<w:r><w:fldChar w:fldCharType="end"/></w:r></w:p>' % nsdecls('w'))
 
 
 def add_header_footer(section, header_text=''):
@@ -249,9 +389,9 @@ def add_header_footer(section, header_text=''):
     hp.text = ''
     # We can't dynamically set chapter name, but we add a placeholder format
     # Set header paragraph formatting
-    set_paragraph_format(hp, alignment=WD_ALIGN_PARAGRAPH.LEFT)  # bidi: LEFT→visually RIGHT
+    set_paragraph_format(hp._element, alignment=WD_ALIGN_PARAGRAPH.LEFT)  # bidi: LEFT→visually RIGHT
     # Add bottom border (like \headrulewidth)
-    add_bottom_border(hp, sz=4, color='808080')
+    add_bottom_border(hp._element, sz=4, color='808080')
 
     # Footer with page number
     footer = section.footer
@@ -261,33 +401,88 @@ def add_header_footer(section, header_text=''):
     else:
         fp = footer.add_paragraph()
     fp.text = ''
-    set_paragraph_format(fp, alignment=WD_ALIGN_PARAGRAPH.CENTER)
-
-    # Add PAGE field
-    run = fp.add_run()
-    fld_char_begin = OxmlElement('w:fldChar')
-    fld_char_begin.set(qn('w:fldCharType'), 'begin')
-    run._element.append(fld_char_begin)
+    set_paragraph_format(fp._element, alignment=WD_ALIGN_PARAGRAPH.CENTER)
 
-    run2 = fp.add_run()
-    instr = OxmlElement('w:instrText')
-    instr.set(qn('xml:space'), 'preserve')
-    instr.text = ' PAGE '
-    run2._element.append(instr)
-
-    run3 = fp.add_run()
-    fld_char_end = OxmlElement('w:fldChar')
-    fld_char_end.set(qn('w:fldCharType'), 'end')
-    run3._element.append(fld_char_end)
-
-    for r in [run, run2, run3]:
-        set_run_font(r, size_pt=11)
+    # Add PAGE field: its three runs from one parse, each given the 11pt Latin rPr
+    field_rpr = build_rpr(ARABIC_FONT, LATIN_FONT, 11, None, None, False)
+    for r in list(parse_xml(PAGE_FIELD_XML)):
+        r.insert(0, copy.deepcopy(field_rpr))
+        fp._element.append(r)
 
 
 # ──────────────────────────────────────────────────────────
 # Main styling
 # ──────────────────────────────────────────────────────────
 
+def style_chapter_heading(p):
+    """Heading 1 (chapters): new page, centered, ruled underneath."""
+    insert_page_break_before(p)
+    set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.CENTER,
+                         space_before=Pt(0), space_after=Pt(36))
+    set_paragraph_runs_font(p, size_pt=24, bold=True, color=COLOR_H1)
+    add_bottom_border(p, sz=6, color='1F3864')
+
+
+def style_section_heading(p, space_before, space_after, size_pt, color):
+    """Heading 2-4 (sections) — bidi swaps LEFT→visually RIGHT."""
+    set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
+                         space_before=space_before, space_after=space_after,
+                         keep_next=True)
+    set_paragraph_runs_font(p, size_pt=size_pt, bold=True, color=color)
+
+
+def style_body_paragraph(p):
+    """Normal body paragraph: a list item, or justified text."""
+    text = paragraph_text(p).strip()
+    if not text:
+        return
+
+    # Detect list items (bullets/numbers) — they often start with specific patterns
+    if text.startswith(LIST_MARKERS):
+        set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
+                             space_before=Pt(2), space_after=Pt(2),
+                             line_spacing=1.5,
+                             first_line_indent=Cm(0))
+        set_paragraph_runs_font(p, size_pt=14)
+    else:
+        # Regular paragraph — justified with 1.5 spacing
+        set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.JUSTIFY,
+                             space_before=Pt(0), space_after=Pt(6),
+                             line_spacing=1.5)
+        set_paragraph_runs_font(p, size_pt=14)
+
+
+# Body paragraph styler per style name
+BODY_STYLERS = {
+    'Heading 1': style_chapter_heading,
+    'Heading 2': functools.partial(style_section_heading, space_before=Pt(24), space_after=Pt(12),
+                                   size_pt=18, color=COLOR_H2),
+    'Heading 3': functools.partial(style_section_heading, space_before=Pt(18), space_after=Pt(8),
+                                   size_pt=16, color=COLOR_H3),
+    'Heading 4': functools.partial(style_section_heading, space_before=Pt(14), space_after=Pt(6),
+                                   size_pt=14, color=COLOR_H4),
+    'Normal': style_body_paragraph,
+}
+
+
+def style_body(paras, style_names, default_style):
+    """Style the chapter headings, sections and Normal body paragraphs / lists.
+
+    `paras` are the body's w:p elements; their style names are resolved through
+    the `style_names` {styleId: name} map, as python-docx's Paragraph.style does.
+    One pass, dispatching each paragraph on its style name.
+    """
+    # (Heading 1 indices: 25, 82, 358, 600, 925)
+    for i, p in enumerate(paras):
+        name = style_names.get(P_STYLE(p) or None, default_style)
+        # Normal paragraphs before 25 are front matter, styled in main()
+        if name == 'Normal' and i < 25:
+            continue
+        styler = BODY_STYLERS.get(name)
+        if styler is not None:
+            styler(p)
+
+
 def main():
     print("Loading main_word.docx...")
     doc = Document(INPUT)
@@ -305,139 +500,42 @@ def main():
 
         # Set document bidi
         sect_pr = section._sectPr
-        bidi = sect_pr.find(qn('w:bidi'))
-        if bidi is None:
-            bidi = OxmlElement('w:bidi')
-            sect_pr.append(bidi)
+        if sect_pr.find(QN_BIDI) is None:
+            SubElement(sect_pr, QN_BIDI)
 
     # ── 2. STYLE DEFINITIONS ──────────────────────────────────
     print("[2/7] Configuring document styles (Normal, Headings)...")
 
     # Normal style
     normal = doc.styles['Normal']
-    normal.font.name = ARABIC_FONT
-    normal.font.size = Pt(14)
+    # 14pt; rFonts (replacing any old one) first, szCs last
     nrpr = normal.element.get_or_add_rPr()
-    nfonts = OxmlElement('w:rFonts')
-    nfonts.set(qn('w:cs'), ARABIC_FONT)
-    nfonts.set(qn('w:ascii'), LATIN_FONT)
-    nfonts.set(qn('w:hAnsi'), LATIN_FONT)
-    # Remove old rFonts if any
-    for old in nrpr.findall(qn('w:rFonts')):
-        nrpr.remove(old)
-    nrpr.insert(0, nfonts)
-
-    nsz = OxmlElement('w:szCs')
-    nsz.set(qn('w:val'), '28')
-    for old in nrpr.findall(qn('w:szCs')):
-        nrpr.remove(old)
-    nrpr.append(nsz)
+    nrpr.get_or_add_sz().set(QN_VAL, '28')
+    replace_props(nrpr, STYLE_RPR_TMPL.format(sz=28, tail=''), front=1)
 
     nppr = normal.element.get_or_add_pPr()
     # Line spacing 1.5
-    spacing = nppr.find(qn('w:spacing'))
+    spacing = nppr.find(QN_SPACING)
     if spacing is None:
-        spacing = OxmlElement('w:spacing')
-        nppr.append(spacing)
-    spacing.set(qn('w:line'), '360')  # 360 twips = 1.5 lines (240 twips = single)
-    spacing.set(qn('w:lineRule'), 'auto')
-    spacing.set(qn('w:after'), '120')   # 6pt after
-    spacing.set(qn('w:before'), '0')
-
-    # RTL/bidi on Normal
-    for old in nppr.findall(qn('w:bidi')):
-        nppr.remove(old)
-    bidi_n = OxmlElement('w:bidi')
-    nppr.append(bidi_n)
-
-    # Justify
-    for old in nppr.findall(qn('w:jc')):
-        nppr.remove(old)
-    jc = OxmlElement('w:jc')
-    jc.set(qn('w:val'), 'both')
-    nppr.append(jc)
-
-    # Heading styles configuration
-    # NOTE: With w:bidi set, Word swaps left/right semantics.
-    # So 'left' in XML = visually RIGHT for RTL paragraphs.
-    heading_configs = {
-        'Heading 1': {'size': 24, 'color': '1F3864', 'space_before': 0, 'space_after': 480, 'align': 'center', 'page_break': True},
-        'Heading 2': {'size': 18, 'color': '2E4057', 'space_before': 360, 'space_after': 200, 'align': 'left', 'page_break': False},
-        'Heading 3': {'size': 16, 'color': '374151', 'space_before': 240, 'space_after': 120, 'align': 'left', 'page_break': False},
-        'Heading 4': {'size': 14, 'color': '4B5563', 'space_before': 200, 'space_after': 100, 'align': 'left', 'page_break': False},
-    }
-
-    for style_name, cfg in heading_configs.items():
-        if style_name not in doc.styles:
-            continue
-        style = doc.styles[style_name]
-        style.font.name = ARABIC_FONT
-        style.font.size = Pt(cfg['size'])
-        style.font.bold = True
-
-        if cfg['color']:
-            style.font.color.rgb = RGBColor.from_string(cfg['color'])
-
-        # rPr
-        rpr = style.element.get_or_add_rPr()
-        for old in rpr.findall(qn('w:rFonts')):
-            rpr.remove(old)
-        hfonts = OxmlElement('w:rFonts')
-        hfonts.set(qn('w:cs'), ARABIC_FONT)
-        hfonts.set(qn('w:ascii'), LATIN_FONT)
-        hfonts.set(qn('w:hAnsi'), LATIN_FONT)
-        rpr.insert(0, hfonts)
-
-        for old in rpr.findall(qn('w:szCs')):
-            rpr.remove(old)
-        hsz = OxmlElement('w:szCs')
-        hsz.set(qn('w:val'), str(cfg['size'] * 2))
-        rpr.append(hsz)
-
-        for old in rpr.findall(qn('w:rtl')):
-            rpr.remove(old)
-        hrtl = OxmlElement('w:rtl')
-        rpr.append(hrtl)
-
-        for old in rpr.findall(qn('w:bCs')):
-            rpr.remove(old)
-        hbcs = OxmlElement('w:bCs')
-        rpr.append(hbcs)
-
-        # pPr
-        ppr = style.element.get_or_add_pPr()
-
-        for old in ppr.findall(qn('w:bidi')):
-            ppr.remove(old)
-        hbidi = OxmlElement('w:bidi')
-        ppr.append(hbidi)
-
-        for old in ppr.findall(qn('w:jc')):
-            ppr.remove(old)
-        hjc = OxmlElement('w:jc')
-        hjc.set(qn('w:val'), cfg['align'])
-        ppr.append(hjc)
-
-        # Spacing
-        for old in ppr.findall(qn('w:spacing')):
-            ppr.remove(old)
-        hspacing = OxmlElement('w:spacing')
-        hspacing.set(qn('w:before'), str(cfg['space_before']))
-        hspacing.set(qn('w:after'), str(cfg['space_after']))
-        hspacing.set(qn('w:line'), '360')
-        hspacing.set(qn('w:lineRule'), 'auto')
-        ppr.append(hspacing)
-
-        # Keep with next
-        kwn = ppr.find(qn('w:keepNext'))
-        if kwn is None:
-            kwn = OxmlElement('w:keepNext')
-            ppr.append(kwn)
+        spacing = SubElement(nppr, QN_SPACING)
+    spacing.set(QN_LINE, '360')  # 360 twips = 1.5 lines (240 twips = single)
+    spacing.set(QN_LINERULE, 'auto')
+    spacing.set(QN_AFTER, '120')   # 6pt after
+    spacing.set(QN_BEFORE, '0')
+
+    # RTL/bidi on Normal, justified
+    replace_props(nppr, STYLE_PPR_TMPL.format(align='both', spacing=''))
+
+    # Heading styles, from the HEADING_STYLES table
+    for style_name, cfg in HEADING_STYLES.items():
+        if style_name in doc.styles:
+            configure_heading_style(doc.styles[style_name].element, cfg)
 
     # ── 3. TITLE PAGE ─────────────────────────────────────────
     print("[3/7] Styling title page...")
 
-    paras = doc.paragraphs
+    # The body's w:p elements, styled directly: no Paragraph/Run wrappers
+    paras = PARAS_XPATH(doc.element.body)
     total = len(paras)
 
     # Title page paragraphs: 0-4
@@ -464,25 +562,10 @@ def main():
 
     # 3: Thesis title - this is the KEY visual element, should have box border
     # Actually looking at the structure: para 0 = institution, para 1 = merged text with title type,
-    # Let me find the one with the actual thesis title
     # From the check: para 0 = المعهد, para 1 = مذكرة + شهادة, para 2 = مؤسسة + students
     # para 3 = تأطير, para 4 = دفعة
-    # The thesis title "تحديات وكالات الأسفار في ظل المنافسة" seems embedded
-    # Let me check if it's in para 1 or separate
-
-    # Actually from the pandoc output, the title's fcolorbox content got merged.
-    # Let me find it by searching
-    thesis_title_idx = None
-    for i in range(min(10, total)):
-        t = paras[i].text.strip()
-        if 'تحديات وكالات الأسفار' in t and len(t) < 200:
-            thesis_title_idx = i
-            break
-
-    if thesis_title_idx is not None:
-        # It's likely embedded in para 1 which has multi-line content
-        # We need to handle differently based on structure
-        pass
+    # The thesis title "تحديات وكالات الأسفار في ظل المنافسة" is embedded in para 1
+    # (the pandoc output merged the fcolorbox content); it gets its border below
 
     # Style paras 3 and 4
     if total > 3:
@@ -515,7 +598,7 @@ def main():
         insert_page_break_before(p)
         set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.CENTER,
                              space_before=Pt(72), space_after=Pt(48))
-        set_paragraph_runs_font(p, size_pt=26, bold=True, color=RGBColor(31, 56, 100))
+        set_paragraph_runs_font(p, size_pt=26, bold=True, color=COLOR_FRONT_TITLE)
 
     # Dedication body: 6-12 (bidi swaps LEFT→visually RIGHT)
     for i in range(6, min(13, total)):
@@ -532,7 +615,7 @@ def main():
         insert_page_break_before(p)
         set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.CENTER,
                              space_before=Pt(72), space_after=Pt(36))
-        set_paragraph_runs_font(p, size_pt=26, bold=True, color=RGBColor(31, 56, 100))
+        set_paragraph_runs_font(p, size_pt=26, bold=True, color=COLOR_FRONT_TITLE)
 
     # Acknowledgments body: 14-19 (bidi swaps LEFT→visually RIGHT)
     for i in range(14, min(20, total)):
@@ -549,7 +632,7 @@ def main():
         insert_page_break_before(p)
         set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.CENTER,
                              space_before=Pt(72), space_after=Pt(36))
-        set_paragraph_runs_font(p, size_pt=26, bold=True, color=RGBColor(31, 56, 100))
+        set_paragraph_runs_font(p, size_pt=26, bold=True, color=COLOR_FRONT_TITLE)
 
     # Abstract body: 21-24
     for i in range(21, min(25, total)):
@@ -562,72 +645,8 @@ def main():
     # ── 5. BODY CONTENT ─────────────────────────────────────
     print("[5/7] Styling body content (headings, paragraphs, lists)...")
 
-    # Heading 1 indices: 25, 82, 358, 600, 925
-    heading1_indices = []
-    for i, p in enumerate(paras):
-        if p.style.name == 'Heading 1':
-            heading1_indices.append(i)
-
-    # Style all Heading 1 (chapters)
-    for idx in heading1_indices:
-        p = paras[idx]
-        insert_page_break_before(p)
-        set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.CENTER,
-                             space_before=Pt(0), space_after=Pt(36))
-        set_paragraph_runs_font(p, size_pt=24, bold=True, color=RGBColor(31, 56, 100))
-        add_bottom_border(p, sz=6, color='1F3864')
-
-    # Style all Heading 2 (sections) — bidi swaps LEFT→visually RIGHT
-    for i, p in enumerate(paras):
-        if p.style.name == 'Heading 2':
-            set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
-                                 space_before=Pt(24), space_after=Pt(12),
-                                 keep_next=True)
-            set_paragraph_runs_font(p, size_pt=18, bold=True, color=RGBColor(46, 64, 87))
-
-    # Style all Heading 3 (subsections) — bidi swaps LEFT→visually RIGHT
-    for i, p in enumerate(paras):
-        if p.style.name == 'Heading 3':
-            set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
-                                 space_before=Pt(18), space_after=Pt(8),
-                                 keep_next=True)
-            set_paragraph_runs_font(p, size_pt=16, bold=True, color=RGBColor(55, 65, 81))
-
-    # Style all Heading 4 (subsubsections) — bidi swaps LEFT→visually RIGHT
-    for i, p in enumerate(paras):
-        if p.style.name == 'Heading 4':
-            set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
-                                 space_before=Pt(14), space_after=Pt(6),
-                                 keep_next=True)
-            set_paragraph_runs_font(p, size_pt=14, bold=True, color=RGBColor(75, 85, 99))
-
-    # Style all Normal body paragraphs (after front matter, idx >= 25)
-    for i in range(25, total):
-        p = paras[i]
-        if p.style.name == 'Normal':
-            text = p.text.strip()
-            if not text:
-                continue
-
-            # Detect list items (bullets/numbers) — they often start with specific patterns
-            is_list = False
-            for marker in ['--', '►', '•']:
-                if text.startswith(marker):
-                    is_list = True
-                    break
-
-            if is_list:
-                set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.LEFT,
-                                     space_before=Pt(2), space_after=Pt(2),
-                                     line_spacing=1.5,
-                                     first_line_indent=Cm(0))
-                set_paragraph_runs_font(p, size_pt=14)
-            else:
-                # Regular paragraph — justified with 1.5 spacing
-                set_paragraph_format(p, alignment=WD_ALIGN_PARAGRAPH.JUSTIFY,
-                                     space_before=Pt(0), space_after=Pt(6),
-                                     line_spacing=1.5)
-                set_paragraph_runs_font(p, size_pt=14)
+    style_names, default_style, _ = paragraph_styles(doc.styles.element)
+    style_body(paras, style_names, default_style)
 
     # ── 6. TABLES ────────────────────────────────────────────
     print("[6/7] Styling tables...")